@@ -1,39 +1,62 @@
 import argparse
-import collections
+import itertools
+import typing
 
+import numpy as np
 
-def _parse_file(filename: str) -> tuple[list[int], list[int]]:
-    with open(filename, "r") as f:
-        lines = f.readlines()
+from aoc import arrays, inputs
 
-    locations_1 = []
-    locations_2 = []
-    for line in lines:
-        l1, l2 = line.split()
-        locations_1.append(int(l1))
-        locations_2.append(int(l2))
 
-    return locations_1, locations_2
+def _parse_file(filename: str) -> np.ndarray:
+    with inputs.mapped(filename) as data:
+        return arrays.ints(data, signed=False).reshape(-1, 2)
 
 
-def _calculate_distance(locations_1: list[int], locations_2: list[int]) -> int:
-    pairs = zip(sorted(locations_1), sorted(locations_2))
-    return sum(abs(l1 - l2) for l1, l2 in pairs)
+def _read_records(filename: str) -> typing.Iterator[tuple[int, int]]:
+    for line in inputs.stream(filename):
+        location_1, location_2 = inputs.ints(line)
+        yield location_1, location_2
 
 
-def _calculate_similarity(locations_1: list[int], locations_2: list[int]) -> int:
-    counter = collections.Counter(locations_2)
-    return sum(l1 * counter[l1] for l1 in locations_1)
+def _as_array(locations: np.ndarray | typing.Iterable[tuple[int, int]]) -> np.ndarray:
+    if isinstance(locations, np.ndarray):
+        return locations
+    # Streamed records still end up in an array: both parts need every location at once.
+    pairs = itertools.chain.from_iterable(locations)
+    return np.fromiter(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _calculate_distance(locations: np.ndarray) -> int:
+    locations_1 = np.sort(locations[:, 0])
+    locations_2 = np.sort(locations[:, 1])
+    return int(np.abs(locations_1 - locations_2).sum())
+
+
+def _calculate_similarity(locations: np.ndarray) -> int:
+    locations_1 = locations[:, 0]
+    locations_2 = np.sort(locations[:, 1])
+    first = np.searchsorted(locations_2, locations_1, side="left")
+    last = np.searchsorted(locations_2, locations_1, side="right")
+    return int((locations_1 * (last - first)).sum())
+
+
+def _part_1(locations: np.ndarray | typing.Iterable[tuple[int, int]]) -> int:
+    return _calculate_distance(_as_array(locations))
+
+
+def _part_2(locations: np.ndarray | typing.Iterable[tuple[int, int]]) -> int:
+    return _calculate_similarity(_as_array(locations))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
     args = parser.parse_args()
 
-    locations_1, locations_2 = _parse_file(args.filename)
-    distance = _calculate_distance(locations_1, locations_2)
-    print(f"Total distance: {distance}")
-
-    similarity = _calculate_similarity(locations_1, locations_2)
-    print(f"Total similarity: {similarity}")
+    if args.stream:
+        locations = inputs.Stream(_read_records, args.filename)
+    else:
+        locations = _parse_file(args.filename)
+    print(f"Total distance: {_part_1(locations)}")
+    print(f"Total similarity: {_part_2(locations)}")
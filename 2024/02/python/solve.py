@@ -1,53 +1,116 @@
 import argparse
-import itertools
+import collections
 import typing
 
+import numpy as np
 
-def _parse_file(filename: str) -> list[list[int]]:
-    with open(filename, "r") as f:
-        lines = f.readlines()
+from aoc import inputs, parallel
 
-    reports = []
-    for line in lines:
-        reports.append([int(level) for level in line.split()])
+# Reports checked together in batched mode, bounding memory when streaming.
+BATCH_SIZE = 100_000
 
-    return reports
 
+def _parse_file(filename: str) -> list[list[int]]:
+    with inputs.mapped(filename) as data:
+        return [inputs.ints(line) for line in inputs.lines(data)]
 
-def _is_safe(report: list[int]) -> bool:
-    is_consistent = report == sorted(report) or report == sorted(report, reverse=True)
-    if not is_consistent:
-        return False
 
-    for l1, l2 in itertools.pairwise(report):
-        if not 0 < abs(l1 - l2) <= 3:
-            return False
+def _read_records(filename: str) -> typing.Iterator[list[int]]:
+    for line in inputs.stream(filename):
+        yield inputs.ints(line)
 
-    return True
 
+def _find_unsafe_step(levels: list[int], direction: int, skipped: int = -1) -> int:
+    """Return the index of the first level whose step from the previous one is
+    not 1 to 3 in `direction` (ignoring the `skipped` index), or -1 if none is.
+    """
+    previous = None
+    for index, level in enumerate(levels):
+        if index == skipped:
+            continue
+        if previous is not None and not 1 <= (level - previous) * direction <= 3:
+            return index
+        previous = level
+    return -1
 
-def _is_safe_dampened(report: list[int]) -> bool:
-    return any(_is_safe(report[:index] + report[index + 1 :]) for index in range(len(report)))
+
+def _is_safe(report: list[int]) -> bool:
+    return any(_find_unsafe_step(report, direction) == -1 for direction in (1, -1))
 
 
-def _partition(
-    predicate: typing.Callable[[typing.Any], bool],
-    sequence: typing.Iterable,
-) -> typing.Iterable:
-    iter1, iter2 = itertools.tee(sequence)
-    return filter(predicate, iter1), itertools.filterfalse(predicate, iter2)
+def _is_safe_dampened(report: list[int]) -> bool:
+    # In a given direction, the first unsafe step can only be fixed by removing one of its levels.
+    for direction in (1, -1):
+        if (unsafe := _find_unsafe_step(report, direction)) == -1:
+            return True
+        for skipped in (unsafe - 1, unsafe):
+            if _find_unsafe_step(report, direction, skipped) == -1:
+                return True
+    return False
+
+
+def _count_safe_batch(reports: list[list[int]], dampened: bool = False) -> int:
+    """Count safe reports with array operations over all reports of the same length at once."""
+    reports_by_length = collections.defaultdict(list)
+    for report in reports:
+        reports_by_length[len(report)].append(report)
+
+    safe_count = 0
+    for length, same_length_reports in reports_by_length.items():
+        levels = np.array(same_length_reports, dtype=np.int64)
+        safe = np.zeros(len(levels), dtype=bool)
+        columns = np.arange(length - 1)
+        for direction in (1, -1):
+            is_unsafe = _find_unsafe_steps(levels, direction)
+            safe |= ~is_unsafe.any(axis=1)
+            if not dampened or length < 2:
+                continue
+            # Step `i` goes from level `i` to `i + 1`: try removing either end of the first
+            # unsafe one (rows with no unsafe step are already counted as safe).
+            unsafe = is_unsafe.argmax(axis=1)
+            for skipped in (unsafe, unsafe + 1):
+                kept = columns + (columns >= skipped[:, np.newaxis])
+                remaining = np.take_along_axis(levels, kept, axis=1)
+                safe |= ~_find_unsafe_steps(remaining, direction).any(axis=1)
+        safe_count += int(safe.sum())
+    return safe_count
+
+
+def _find_unsafe_steps(levels: np.ndarray, direction: int) -> np.ndarray:
+    steps = np.diff(levels, axis=1) * direction
+    return (steps < 1) | (steps > 3)
+
+
+def _count_safe(
+    reports: typing.Iterable[list[int]],
+    dampened: bool,
+    batched: bool,
+) -> int:
+    if batched:
+        batches = parallel.chunks(reports, BATCH_SIZE)
+        return sum(_count_safe_batch(batch, dampened) for batch in batches)
+    is_safe = _is_safe_dampened if dampened else _is_safe
+    return sum(is_safe(report) for report in reports)
+
+
+def _part_1(reports: typing.Iterable[list[int]], batched: bool = False) -> int:
+    return _count_safe(reports, dampened=False, batched=batched)
+
+
+def _part_2(reports: typing.Iterable[list[int]], batched: bool = False) -> int:
+    return _count_safe(reports, dampened=True, batched=batched)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
+    parser.add_argument("--batched", action="store_true", help="check reports as NumPy arrays")
     args = parser.parse_args()
 
-    reports = _parse_file(args.filename)
-    safe_reports, unsafe_reports = _partition(_is_safe, reports)
-    safe_reports = list(safe_reports)
-    print(f"Safe report # (raw): {len(safe_reports)}")
-
-    safe_reports_dampened = filter(_is_safe_dampened, unsafe_reports)
-    safe_reports.extend(safe_reports_dampened)
-    print(f"Safe report # (dampened): {len(safe_reports)}")
+    if args.stream:
+        reports = inputs.Stream(_read_records, args.filename)
+    else:
+        reports = _parse_file(args.filename)
+    print(f"Safe report # (raw): {_part_1(reports, batched=args.batched)}")
+    print(f"Safe report # (dampened): {_part_2(reports, batched=args.batched)}")
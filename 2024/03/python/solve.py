@@ -1,34 +1,58 @@
 import argparse
 import re
+import typing
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> list[list[int]]:
-    with open(filename, "r") as f:
-        memory = f.read()
-    return memory
+INSTRUCTION = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+LONGEST_INSTRUCTION = len(b"mul(123,456)")
+ENABLE = b"do()"
+DISABLE = b"don't()"
 
 
-def _extract_instructions(memory: str) -> list[re.Match]:
-    condensed_memory = ""
-    do = True
-    while memory:
-        scoped, _, memory = memory.partition("don't()" if do else "do()")
-        if do:
-            condensed_memory += scoped
-        do = not do
-    pattern = r"mul\(\d{1,3},\d{1,3}\)"
-    instructions = re.findall(pattern, condensed_memory)
-    return instructions
+def _parse_file(filename: str) -> inputs.Stream[bytes]:
+    # Memory dumps can be large: parts read them block by block instead
+    return inputs.Stream(_read_records, filename)
 
 
-def _execute_instructions(instructions: list[str]) -> list[int]:
-    results = {}
-    pattern = r"mul\((?P<op1>\d{1,3}),(?P<op2>\d{1,3})\)"
-    for instruction in instructions:
-        if match := re.match(pattern, instruction):
-            result = int(match.group("op1")) * int(match.group("op2"))
-            results[instruction] = result
-    return results
+def _read_records(filename: str) -> typing.Iterator[bytes]:
+    return inputs.blocks(filename)
+
+
+def _scan(chunks: typing.Iterable[inputs.Buffer]) -> typing.Iterator[re.Match]:
+    """Yield every instruction of the memory split into `chunks`, in order.
+
+    The tail of a chunk which may hold the start of an instruction cut off by
+    the next chunk is carried over and scanned again with it, so instructions
+    straddling a boundary are found and memory is bounded by the chunk size.
+    """
+    carried = b""
+    for chunk in chunks:
+        memory = carried + chunk
+        # A match starting before `cutoff` ends within this chunk, whatever comes next
+        cutoff = len(memory) - LONGEST_INSTRUCTION + 1
+        resume = 0
+        for match in INSTRUCTION.finditer(memory):
+            if match.start() >= cutoff:
+                break
+            yield match
+            resume = match.end()
+        carried = memory[max(resume, cutoff) :]  # noqa: E203
+    yield from INSTRUCTION.finditer(carried)
+
+
+def _part_1(memory: typing.Iterable[inputs.Buffer]) -> int:
+    total = 0
+    enabled = True
+    for match in _scan(memory):
+        instruction = match[0]
+        if instruction == ENABLE:
+            enabled = True
+        elif instruction == DISABLE:
+            enabled = False
+        elif enabled:
+            total += int(match[1]) * int(match[2])
+    return total
 
 
 if __name__ == "__main__":
@@ -37,6 +61,4 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     memory = _parse_file(args.filename)
-    instructions = _extract_instructions(memory)
-    results = _execute_instructions(instructions)
-    print(f"Sum of multipy instructions: {sum(results.values())}")
+    print(f"Sum of multipy instructions: {_part_1(memory)}")
@@ -1,173 +1,140 @@
 import argparse
-import dataclasses
-import enum
+import re
+import typing
 
+import numpy as np
 
-class Direction(enum.Enum):
-    LEFT = "left"
-    RIGHT = "right"
-    UP = "up"
-    DOWN = "down"
-    LEFT_UP = "left_up"
-    LEFT_DOWN = "left_down"
-    RIGHT_UP = "right_up"
-    RIGHT_DOWN = "right_down"
+from aoc import inputs
+from aoc.grid import Grid
 
 
-@dataclasses.dataclass
-class Letter:
-    value: str
-    in_word: bool = False
-
-    def __str__(self):
-        return self.value
+class WordBlock:
+    def __init__(self, raw_block: bytes):
+        self.grid = Grid.from_buffer(raw_block)
+        self.in_word = np.zeros(len(self.grid.cells), dtype=bool)
 
+    @property
+    def width(self) -> int:
+        return self.grid.width
 
-class WordBlock:
-    def __init__(self, raw_block: str):
-        self.width = 0
-        self.height = 0
-        self.rows = []
-        for row in raw_block.split("\n"):
-            self.rows.append([Letter(letter) for letter in row])
-            self.height += 1
-            self.width = max(self.width, len(row))
-
-    def __getitem__(self, key):
-        return self.rows.__getitem__(key)
+    @property
+    def height(self) -> int:
+        return self.grid.height
 
     @property
     def raw(self):
-        return "\n".join(("".join(letter.value for letter in row)) for row in self.rows)
+        return str(self.grid)
 
     @property
     def detected(self):
         return "\n".join(
-            ("".join(letter.value if letter.in_word else "." for letter in row))
-            for row in self.rows
+            "".join(self.grid[index] if self.in_word[index] else "." for index in indexes)
+            for indexes in map(self.grid.row_indexes, range(self.height))
         )
 
+    @property
+    def forward_offsets(self) -> tuple[int, ...]:
+        # Every other direction reads one of these lines backwards
+        stride = self.grid.stride
+        return (1, stride - 1, stride, stride + 1)
+
     def find_matches(self, word: str) -> int:
-        matches = 0
-        for row in range(self.height):
-            for column in range(self.width):
-                for direction in Direction:
-                    if self._find_match(
-                        row,
-                        column,
-                        direction,
-                        match="XMAS",
-                        mark_letters=True,
-                    ):
-                        matches += 1
-        return matches
-
-    def find_xs(self, word: str) -> str:
-        center_index = int((len(word) - 1) / 2)
-        half_1 = word[center_index::-1]
-        half_2 = word[center_index:]
-
-        matches = 0
-        for row in range(self.height):
-            for column in range(self.width):
-                slant_1 = (
-                    self._find_match(row, column, Direction.LEFT_UP, half_1)
-                    and self._find_match(row, column, Direction.RIGHT_DOWN, half_2)
-                ) or (
-                    self._find_match(row, column, Direction.RIGHT_DOWN, half_1)
-                    and self._find_match(row, column, Direction.LEFT_UP, half_2)
-                )
-                slant_2 = (
-                    self._find_match(row, column, Direction.LEFT_DOWN, half_1)
-                    and self._find_match(row, column, Direction.RIGHT_UP, half_2)
-                ) or (
-                    self._find_match(row, column, Direction.RIGHT_UP, half_1)
-                    and self._find_match(row, column, Direction.LEFT_DOWN, half_2)
-                )
-                if slant_1 and slant_2:
-                    matches += 1
-                    self[row][column].in_word = True
-                    self[row - 1][column - 1].in_word = True
-                    self[row - 1][column + 1].in_word = True
-                    self[row + 1][column - 1].in_word = True
-                    self[row + 1][column + 1].in_word = True
-
-        return matches
-
-    def _find_match(
-        self,
-        row: int,
-        column: int,
-        direction: Direction,
-        match: str,
-        mark_letters: bool = False,
-    ) -> bool:
-        if row < 0 or row >= self.height or column < 0 or column >= self.width:
-            return False
-
-        if (letter := self[row][column]).value != match[0]:
-            return False
-
-        if len(match) == 1:
-            if mark_letters:
-                letter.in_word = True
-            return True
-
-        match direction:
-            case Direction.LEFT:
-                next_row = row
-                next_column = column + 1
-            case Direction.RIGHT:
-                next_row = row
-                next_column = column - 1
-            case Direction.UP:
-                next_row = row - 1
-                next_column = column
-            case Direction.DOWN:
-                next_row = row + 1
-                next_column = column
-            case Direction.LEFT_UP:
-                next_row = row - 1
-                next_column = column - 1
-            case Direction.LEFT_DOWN:
-                next_row = row + 1
-                next_column = column - 1
-            case Direction.RIGHT_UP:
-                next_row = row - 1
-                next_column = column + 1
-            case Direction.RIGHT_DOWN:
-                next_row = row + 1
-                next_column = column + 1
-
-        if self._find_match(
-            next_row,
-            next_column,
-            direction,
-            match[1:],
-            mark_letters=mark_letters,
-        ):
-            letter.in_word = True
-            return True
-
-        return False
-
-
-def _parse_file(filename: str) -> WordBlock:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return raw.strip()
+        """Count `word` in all eight directions, reading each line of the grid once per axis."""
+        count_forward = _counter(word.encode())
+        count_backward = _counter(word[::-1].encode())
+        return sum(
+            count_forward(line) + count_backward(line)
+            for offset in self.forward_offsets
+            for line in self.grid.lines(offset)
+        )
+
+    def find_xs(self, word: str) -> int:
+        return int(self._find_x_centers(word).sum())
+
+    def mark_matches(self, word: str):
+        """Flag the letters of every match of `word` in `in_word`, for `detected`."""
+        cells = np.frombuffer(self.grid.cells, dtype=np.uint8)
+        margin = (len(word) - 1) * (self.grid.stride + 1)
+        padded = np.pad(cells, margin)
+        for offset in self.grid.adjacent_offsets:
+            is_start = np.ones(len(cells), dtype=bool)
+            for position, letter in enumerate(word.encode()):
+                shift = margin + position * offset
+                is_start &= padded[shift : shift + len(cells)] == letter  # noqa: E203
+            starts = np.flatnonzero(is_start)
+            for position in range(len(word)):
+                self.in_word[starts + position * offset] = True
+
+    def mark_xs(self, word: str):
+        """Flag the letters of every X of `word` in `in_word`, for `detected`."""
+        rows, columns = np.nonzero(self._find_x_centers(word))
+        centers = self.grid.index(rows, columns)
+        self.in_word[centers] = True
+        for offset in self.grid.diagonal_offsets:
+            for distance in range(1, len(word) // 2 + 1):
+                self.in_word[centers + distance * offset] = True
+
+    def _find_x_centers(self, word: str) -> np.ndarray:
+        """Return a `height` x `width` mask of the cells where two `word`s cross diagonally."""
+        reach = len(word) // 2
+        padding = self.grid.padding
+        letters = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(-1, self.grid.stride)
+        rows = slice(padding, padding + self.height)
+        columns = slice(padding, padding + self.width)
+        letters = np.pad(letters[rows, columns], reach)
+
+        def _shifted(row_delta: int, column_delta: int) -> np.ndarray:
+            top, left = reach + row_delta, reach + column_delta
+            return letters[top : top + self.height, left : left + self.width]  # noqa: E203
+
+        def _spells(delta: tuple[int, int], half: str) -> np.ndarray:
+            matches = np.ones((self.height, self.width), dtype=bool)
+            for distance, letter in enumerate(half.encode()[1:], start=1):
+                matches &= _shifted(distance * delta[0], distance * delta[1]) == letter
+            return matches
+
+        half_1 = word[reach::-1]
+        half_2 = word[reach:]
+        is_center = _shifted(0, 0) == ord(word[reach])
+        for delta_1, delta_2 in (((-1, -1), (1, 1)), ((1, -1), (-1, 1))):
+            is_center &= (_spells(delta_1, half_1) & _spells(delta_2, half_2)) | (
+                _spells(delta_2, half_1) & _spells(delta_1, half_2)
+            )
+        return is_center
+
+
+def _counter(word: bytes) -> typing.Callable[[bytes], int]:
+    """Return a function counting (possibly overlapping) occurrences of `word` in a string."""
+    if any(word[:size] == word[-size:] for size in range(1, len(word))):
+        pattern = re.compile(b"(?=" + re.escape(word) + b")")
+        return lambda line: sum(1 for _ in pattern.finditer(line))
+    return lambda line: line.count(word)
+
+
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(data)
+
+
+def _part_1(raw_word_block: bytes) -> int:
+    return WordBlock(raw_word_block).find_matches("XMAS")
+
+
+def _part_2(raw_word_block: bytes) -> int:
+    return WordBlock(raw_word_block).find_xs("MAS")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--show", action="store_true", help="print the letters of every match")
     args = parser.parse_args()
 
     raw_word_block = _parse_file(args.filename)
-    block = WordBlock(raw_word_block)
-    word_count = block.find_matches("XMAS")
-    print(f"XMAS #: {word_count}")
-
-    block = WordBlock(raw_word_block)
-    word_count = block.find_xs("MAS")
-    print(f"X-MAS #: {word_count}")
+    print(f"XMAS #: {_part_1(raw_word_block)}")
+    print(f"X-MAS #: {_part_2(raw_word_block)}")
+    if args.show:
+        for mark, word in ((WordBlock.mark_matches, "XMAS"), (WordBlock.mark_xs, "MAS")):
+            word_block = WordBlock(raw_word_block)
+            mark(word_block, word)
+            print(f"\n{word_block.detected}")
@@ -1,53 +1,124 @@
 import argparse
 import collections
 import dataclasses
-import functools
+import graphlib
 import itertools
 import typing
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> tuple[dict[str, list[str]], list[list[str]]]:
-    with open(filename, "r") as f:
-        raw = f.read()
-    raw_rules, raw_updates = raw.strip().split("\n\n")
 
+def _parse_file(filename: str) -> tuple[dict[str, list[str]], list[list[str]]]:
     rules = collections.defaultdict(list)
-    for rule in raw_rules.split():
-        preceder, follower = rule.split("|")
-        rules[preceder].append(follower)
-
     updates = []
-    for update in raw_updates.split():
-        updates.append(update.split(","))
+    with inputs.mapped(filename) as data:
+        raw_rules, raw_updates = inputs.records(data)
+        for rule in inputs.lines(raw_rules):
+            preceder, follower = inputs.text(rule).split("|")
+            rules[preceder].append(follower)
+
+        for update in inputs.lines(raw_updates):
+            updates.append(inputs.text(update).split(","))
+        del raw_rules, raw_updates
 
     return rules, updates
 
 
 @dataclasses.dataclass
 class Validator:
+    """Ordering rules indexed by page id: bit `ids[q]` of `followers[ids[p]]` (and bit `ids[p]`
+    of `preceders[ids[q]]`) is set when a rule requires page `p` to come before page `q`.
+    """
+
     rules: dict[str, list[str]]
+    ids: dict[str, int] = dataclasses.field(init=False, default_factory=dict)
+    followers: list[int] = dataclasses.field(init=False, default_factory=list)
+    preceders: list[int] = dataclasses.field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        for preceder, followers in self.rules.items():
+            preceder_id = self._id(preceder)
+            for follower in followers:
+                follower_id = self._id(follower)
+                self.followers[preceder_id] |= 1 << follower_id
+                self.preceders[follower_id] |= 1 << preceder_id
+
+    def _id(self, page: str) -> int:
+        if (page_id := self.ids.get(page)) is None:
+            page_id = self.ids[page] = len(self.ids)
+            self.followers.append(0)
+            self.preceders.append(0)
+        return page_id
+
+    def _page_ids(self, update: list[str]) -> list[int]:
+        """Return the id of each page in `update`, without registering new pages: those without
+        rules get ids past the known ones, for this update only.
+        """
+        unknown_ids = itertools.count(len(self.ids))
+        return [self.ids[page] if page in self.ids else next(unknown_ids) for page in update]
+
+    def _followers(self, page_id: int) -> int:
+        return self.followers[page_id] if page_id < len(self.followers) else 0
+
+    def _preceders(self, page_id: int) -> int:
+        return self.preceders[page_id] if page_id < len(self.preceders) else 0
 
     def is_valid(self, update: list[str]) -> bool:
-        for i, page in enumerate(update):
-            allowed_followers = self.rules[page]
-            if not all(later_page in allowed_followers for later_page in update[i + 1 :]):
+        later_pages = 0
+        for page_id in reversed(self._page_ids(update)):
+            if self._followers(page_id) & later_pages != later_pages:
                 return False
+            later_pages |= 1 << page_id
         return True
 
-    def compare(self, page_1: str, page_2: str) -> int:
-        if page_2 in self.rules.get(page_1, []):
-            return -1
-        elif page_1 in self.rules.get(page_2, []):
-            return 1
-        else:
-            return 0
+    def reorder(self, update: list[str]) -> list[str]:
+        if ranks := self._rank(update):
+            reordered = [""] * len(update)
+            for page, rank in zip(update, ranks):
+                reordered[rank] = page
+            return reordered
+
+        page_ids = self._page_ids(update)
+        pages = dict(zip(page_ids, update))
+        in_update = sum(1 << page_id for page_id in pages)
+        graph = {
+            page_id: _bits(self._preceders(page_id) & in_update & ~(1 << page_id))
+            for page_id in pages
+        }
+        return [pages[page_id] for page_id in graphlib.TopologicalSorter(graph).static_order()]
+
+    def middle_page(self, update: list[str]) -> str:
+        center_index = (len(update) - 1) // 2
+        if ranks := self._rank(update):
+            return update[ranks.index(center_index)]
+        return self.reorder(update)[center_index]
+
+    def _rank(self, update: list[str]) -> list[int] | None:
+        """Return each page's position in the reordered update, if the rules order all of its
+        pages (so that the `i`-th page must precede exactly `len(update) - 1 - i` others).
+        """
+        page_ids = self._page_ids(update)
+        in_update = 0
+        for page_id in page_ids:
+            in_update |= 1 << page_id
+        last = len(update) - 1
+        ranks = [last - (self._followers(page_id) & in_update).bit_count() for page_id in page_ids]
+        if len(set(ranks)) != len(ranks) or min(ranks, default=0) < 0:
+            return None
+        return ranks
+
+
+def _bits(mask: int) -> typing.Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
 
 
 def _partition_updates(
     updates: list[list[str]],
-    rules: dict[str, list[str]],
+    validator: Validator,
 ) -> list[list[str]]:
-    validator = Validator(rules)
     return _partition(validator.is_valid, updates)
 
 
@@ -59,21 +130,22 @@ def _partition(
     return filter(predicate, iter1), itertools.filterfalse(predicate, iter2)
 
 
-def _reorder_updates(
-    updates: list[list[str]],
-    rules: dict[str, list[str]],
-) -> list[list[str]]:
-    validator = Validator(rules)
-    for update in updates:
-        yield sorted(update, key=functools.cmp_to_key(validator.compare))
+def _sum_middle_pages(updates: typing.Iterable[list[str]]) -> int:
+    return sum(int(update[(len(update) - 1) // 2]) for update in updates)
 
 
-def _sum_middle_pages(updates: list[list[str]]):
-    sum_ = 0
-    for update in updates:
-        center_index = int((len(update) - 1) / 2)
-        sum_ += int(update[center_index])
-    return sum_
+def _part_1(manual: tuple[dict[str, list[str]], list[list[str]]]) -> int:
+    rules, updates = manual
+    valid_updates, _ = _partition_updates(updates, Validator(rules))
+    return _sum_middle_pages(valid_updates)
+
+
+def _part_2(manual: tuple[dict[str, list[str]], list[list[str]]]) -> int:
+    rules, updates = manual
+    validator = Validator(rules)
+    _, invalid_updates = _partition_updates(updates, validator)
+    # Only the middle page of each fixed update is needed, not the whole reordered update
+    return sum(int(validator.middle_page(update)) for update in invalid_updates)
 
 
 if __name__ == "__main__":
@@ -81,12 +153,6 @@ if __name__ == "__main__":
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    rules, updates = _parse_file(args.filename)
-    valid_updates, invalid_updates = _partition_updates(updates, rules)
-
-    sum_ = _sum_middle_pages(valid_updates)
-    print(f"Sum of valid updates' center page numbers: {sum_}")
-
-    fixed_updates = _reorder_updates(invalid_updates, rules)
-    sum_ = _sum_middle_pages(fixed_updates)
-    print(f"Sum of fixed updates' center page numbers: {sum_}")
+    manual = _parse_file(args.filename)
+    print(f"Sum of valid updates' center page numbers: {_part_1(manual)}")
+    print(f"Sum of fixed updates' center page numbers: {_part_2(manual)}")
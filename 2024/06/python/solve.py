@@ -1,138 +1,82 @@
 import argparse
-import copy
 import dataclasses
-import enum
+import functools
 
-
-class LoopError(Exception): ...
+from aoc import inputs, parallel
+from aoc.grid import ARROWS, Grid
 
 
-class Direction(enum.Enum):
-    LEFT = "left"
-    RIGHT = "right"
-    UP = "up"
-    DOWN = "down"
+class LoopError(Exception): ...
 
-    @classmethod
-    def horizontals(cls):
-        return {cls.LEFT, cls.RIGHT}
 
-    @classmethod
-    def verticals(cls):
-        return {cls.UP, cls.DOWN}
-
-
-@dataclasses.dataclass
-class Position:
-    row: int
-    column: int
-    visited_directions: set[Direction] = dataclasses.field(default_factory=set)
-    obstructed: bool = False
-    test: bool = False
-
-    @property
-    def visited(self):
-        return bool(self.visited_directions)
-
-    def __str__(self):
-        if self.visited_directions.intersection(
-            Direction.verticals()
-        ) and self.visited_directions.intersection(Direction.horizontals()):
-            c = "+"
-        elif self.visited_directions.intersection(Direction.verticals()):
-            c = "|"
-        elif self.visited_directions.intersection(Direction.horizontals()):
-            c = "-"
-        elif self.obstructed and self.test:
-            c = "O"
-        elif self.obstructed:
-            c = "#"
-        else:
-            c = "."
-        return c
+OUTSIDE = 0
+EXIT = -1
+OBSTRUCTION = ord("#")
 
 
 @dataclasses.dataclass
 class Guard:
-    row: int
-    column: int
-    facing: Direction
+    index: int
+    facing: int
 
     def __str__(self):
-        match self.facing:
-            case Direction.UP:
-                c = "^"
-            case Direction.RIGHT:
-                c = ">"
-            case Direction.DOWN:
-                c = "v"
-            case Direction.LEFT:
-                c = "<"
-        return c
+        return ARROWS[self.facing]
 
     def turn_right(self):
-        match self.facing:
-            case Direction.UP:
-                self.facing = Direction.RIGHT
-            case Direction.RIGHT:
-                self.facing = Direction.DOWN
-            case Direction.DOWN:
-                self.facing = Direction.LEFT
-            case Direction.LEFT:
-                self.facing = Direction.UP
+        self.facing = (self.facing + 1) % 4
 
 
 class Map:
-    grid: list[list[Position]]
+    grid: Grid
+    visited: bytearray
     guard: Guard
 
-    def __init__(self, raw_grid: str):
-        self.grid = []
+    def __init__(self, raw_grid: bytes):
+        self.grid = None
+        self.visited = None
         self.guard = None
         self.reset(raw_grid)
 
-    def reset(self, raw_grid: str):
-        self.grid = []
-        for row_index, raw_row in enumerate(raw_grid.split()):
-            row = []
-            for column_index, raw_position in enumerate(raw_row):
-                if is_guard := (raw_position.lower() in ("^", ">", "<", "v")):
-                    match raw_position:
-                        case "^":
-                            direction = Direction.UP
-                        case ">":
-                            direction = Direction.RIGHT
-                        case "v":
-                            direction = Direction.DOWN
-                        case "<":
-                            direction = Direction.LEFT
-                    self.guard = Guard(
-                        row=row_index,
-                        column=column_index,
-                        facing=direction,
-                    )
-                position = Position(
-                    row=row_index,
-                    column=column_index,
-                    visited_directions={self.guard.facing} if is_guard else set(),
-                    obstructed=raw_position == "#",
-                )
-                row.append(position)
-            self.grid.append(row)
+    def reset(self, raw_grid: bytes):
+        # Each position's visited directions are stored as one bit per facing.
+        self.grid = Grid.from_buffer(raw_grid)
+        self.visited = bytearray(len(self.grid.cells))
+        for facing, arrow in enumerate(ARROWS):
+            if (index := self.grid.find(arrow)) != -1:
+                self.guard = Guard(index=index, facing=facing)
+                self.visited[index] = 1 << facing
 
     def __getitem__(self, key):
         return self.grid.__getitem__(key)
 
     def __str__(self):
         rendered_rows = []
-        for row in self.grid:
-            rendered_row = [str(position) for position in row]
-            rendered_rows.append(rendered_row)
-
-        if self.guard:
-            rendered_rows[self.guard.row][self.guard.column] = str(self.guard)
+        for row in range(self.grid.height):
+            rendered_row = [self._render(index) for index in self.grid.row_indexes(row)]
+            rendered_rows.append("".join(rendered_row))
+        return "\n".join(rendered_rows)
+
+    def _render(self, index: int) -> str:
+        if self.guard and self.guard.index == index:
+            return str(self.guard)
+
+        visited = self.visited[index]
+        vertical = visited & 0b0101
+        horizontal = visited & 0b1010
+        if vertical and horizontal:
+            c = "+"
+        elif vertical:
+            c = "|"
+        elif horizontal:
+            c = "-"
+        elif self.grid.cells[index] == OBSTRUCTION:
+            c = "#"
+        else:
+            c = "."
+        return c
 
-        return "\n".join("".join(row) for row in rendered_rows)
+    def visited_count(self) -> int:
+        return len(self.visited) - self.visited.count(0)
 
     def play(self):
         while self.step():
@@ -142,55 +86,135 @@ class Map:
         if not self.guard:
             return False
 
-        next_position = self.get_guard_next_position()
-        if next_position is None:
+        next_index = self.get_guard_next_index()
+        if next_index is None:
             self.guard = None
-        elif next_position.obstructed:
+        elif self.grid.cells[next_index] == OBSTRUCTION:
             self.guard.turn_right()
-            self.grid[self.guard.row][self.guard.column].visited_directions.add(self.guard.facing)
+            self.visited[self.guard.index] |= 1 << self.guard.facing
         else:
-            self.guard.row = next_position.row
-            self.guard.column = next_position.column
-            if self.guard.facing in next_position.visited_directions:
+            self.guard.index = next_index
+            if self.visited[next_index] & (1 << self.guard.facing):
                 raise LoopError()
-            next_position.visited_directions.add(self.guard.facing)
+            self.visited[next_index] |= 1 << self.guard.facing
 
         return True
 
-    def get_guard_next_position(self):
+    def get_guard_next_index(self) -> int | None:
         if not self.guard:
             return None
 
-        row_delta = 0
-        column_delta = 0
-        match self.guard.facing:
-            case Direction.UP:
-                row_delta = -1
-            case Direction.RIGHT:
-                column_delta = 1
-            case Direction.DOWN:
-                row_delta = 1
-            case Direction.LEFT:
-                column_delta = -1
-
-        next_row = self.guard.row + row_delta
-        next_column = self.guard.column + column_delta
-        if (
-            next_row < 0
-            or next_row >= len(self.grid)
-            or next_column < 0
-            or next_column >= len(self.grid[next_row])
-        ):
-            next_position = None
-        else:
-            next_position = self.grid[self.guard.row + row_delta][self.guard.column + column_delta]
-        return next_position
+        next_index = self.guard.index + self.grid.orthogonal_offsets[self.guard.facing]
+        if self.grid.cells[next_index] == OUTSIDE:
+            return None
+        return next_index
+
+
+class JumpTable:
+    """Where a guard stops when walking straight from any cell in each facing.
+
+    `stops[facing][index]` is the last cell before the next obstruction (or
+    `EXIT` if the guard walks off the map first), so a walk can leap from one
+    turn to the next. A single extra obstruction is overlaid on a walk by
+    checking whether it cuts the current leap short, so the map is never copied.
+    """
+
+    def __init__(self, grid: Grid):
+        self.stride = grid.stride
+        self.offsets = grid.orthogonal_offsets
+        self.stops = [self._find_stops(grid.cells, offset) for offset in self.offsets]
+
+    @staticmethod
+    def _find_stops(cells: bytearray, offset: int) -> list[int]:
+        # Cells are visited so that the one ahead of each is always resolved first
+        stops = [EXIT] * len(cells)
+        indexes = range(len(cells)) if offset < 0 else range(len(cells) - 1, -1, -1)
+        for index in indexes:
+            if cells[index] in (OUTSIDE, OBSTRUCTION):
+                continue
+            ahead = cells[index + offset]
+            if ahead == OBSTRUCTION:
+                stops[index] = index
+            elif ahead != OUTSIDE:
+                stops[index] = stops[index + offset]
+        return stops
+
+    def loops(self, index: int, facing: int, obstruction: int) -> bool:
+        """Whether a guard at `index` and `facing` loops once `obstruction` is added."""
+        # Each cell's turning states are stored as one bit per facing. Any loop
+        # goes through a turn, so only those need to be recorded.
+        turned = bytearray(len(self.stops[0]))
+        obstruction_row, obstruction_column = divmod(obstruction, self.stride)
+        while True:
+            offset = self.offsets[facing]
+            stop = self.stops[facing][index]
+            if offset in (-1, 1):
+                in_line = obstruction_row == index // self.stride
+            else:
+                in_line = obstruction_column == index % self.stride
+            if (
+                in_line
+                and (obstruction - index) * offset > 0
+                and (stop == EXIT or (stop - obstruction) * offset >= 0)
+            ):
+                stop = obstruction - offset
+            elif stop == EXIT:
+                return False
+
+            if turned[stop] & (1 << facing):
+                return True
+            turned[stop] |= 1 << facing
+            index, facing = stop, (facing + 1) % 4
+
+
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(data)
+
+
+def _part_1(raw_map: bytes) -> int:
+    map_ = Map(raw_map)
+    map_.play()
+    return map_.visited_count()
 
 
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw_grid = f.read()
-    return raw_grid
+def _find_candidates(raw_map: bytes) -> list[tuple[int, int, int]]:
+    """Walk the guard's original path, returning the guard's index and facing on reaching each
+    cell the path has not yet crossed, along with that cell's index.
+
+    Blocking that cell is only worth testing then: any earlier, and the guard
+    would have bumped into it on the way.
+    """
+    map_ = Map(raw_map)
+    candidates = []
+    while (next_index := map_.get_guard_next_index()) is not None:
+        if not (map_.grid.cells[next_index] == OBSTRUCTION or map_.visited[next_index]):
+            candidates.append((map_.guard.index, map_.guard.facing, next_index))
+        map_.step()
+    return candidates
+
+
+def _find_loops(jump_table: JumpTable, candidates: list[tuple[int, int, int]]) -> list[int]:
+    return [
+        obstruction
+        for index, facing, obstruction in candidates
+        if jump_table.loops(index, facing, obstruction)
+    ]
+
+
+def _part_2(raw_map: bytes, verbose: bool = False) -> int:
+    candidates = _find_candidates(raw_map)
+    if verbose:
+        print(f"Testing {len(candidates)} candidate obstructions")
+
+    # Trials are independent once the original path is known: each worker gets
+    # one batch of candidates, so the jump table is only sent to it once.
+    jump_table = JumpTable(Map(raw_map).grid)
+    find_loops = functools.partial(_find_loops, jump_table)
+    obstructions_causing_loops = set()
+    for loops in parallel.map(find_loops, parallel.batches(candidates)):
+        obstructions_causing_loops.update(loops)
+    return len(obstructions_causing_loops)
 
 
 if __name__ == "__main__":
@@ -200,34 +224,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     raw_map = _parse_file(args.filename)
-    map_ = Map(raw_map)
-    map_.play()
+    print(f"Number of visited positions: {_part_1(raw_map)}")
 
-    visited_positions = len(
-        [position for row in map_.grid for position in row if position.visited]
-    )
-    print(f"Number of visited positions: {visited_positions}")
-
-    map_.reset(raw_map)
-    obstructions_causing_loops = []
-    changed = True
-    step = 0
-    while changed:
-        if args.verbose:
-            print(f"Step {step}/{visited_positions-1}")
-        trial_map = copy.deepcopy(map_)
-
-        if not (next_position := trial_map.get_guard_next_position()):
-            break
-        elif not (next_position.obstructed or next_position.visited):
-            next_position.obstructed = True
-            next_position.test = True
-            try:
-                trial_map.play()
-            except LoopError:
-                obstructions_causing_loops.append(next_position)
-
-        changed = map_.step()
-        step += 1
-
-    print(f"Number of potential loop-causing obstructions: {len(obstructions_causing_loops)}")
+    loops = _part_2(raw_map, verbose=args.verbose)
+    print(f"Number of potential loop-causing obstructions: {loops}")
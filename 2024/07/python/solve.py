@@ -1,84 +1,127 @@
 import argparse
-import itertools
+import dataclasses
+import functools
 import typing
 
+from aoc import inputs, parallel
 
-def _parse_file(filename: str) -> dict[int, list[str]]:
-    with open(filename, "r") as f:
-        raw_lines = f.readlines()
+Equation: typing.TypeAlias = tuple[int, list[int]]
 
-    equations = {}
-    for line in raw_lines:
-        test_value, operands = line.split(":")
-        equations[int(test_value.strip())] = [val.strip() for val in operands.split()]
-    return equations
 
+@dataclasses.dataclass(frozen=True)
+class Operator:
+    """A binary operator, as used right-to-left: `undo(result, right)` returns the left operand
+    for which `left <symbol> right == result`, or None if there is none.
+    """
 
-def _validate_equations(
-    equations: dict[int, list[str]],
-    operators: list[str],
-) -> dict[int, list[int]]:
-    valid_equations = {}
-    for test_value, operands in equations.items():
-        for possible_equation in _generate_equations(operands, operators):
-            if _evaluates(possible_equation, test_value):
-                valid_equations[test_value] = possible_equation
-                break
-    return valid_equations
+    symbol: str
+    undo: typing.Callable[[int, int], int | None]
 
 
-def _generate_equations(
-    operands: list[str],
-    operators: list[str],
-) -> typing.Iterator[str]:
-    operator_permutations = _permute(operators, len(operands) - 1)
-    for permutation in operator_permutations:
-        yield _interleave(operands, permutation)
+def _undo_add(result: int, right: int) -> int | None:
+    return result - right if result >= right else None
 
 
-def _permute(operators: list[str], length: int) -> typing.Iterator[str]:
-    if length == 1:
-        for operator in operators:
-            yield (operator,)
-        return
+def _undo_multiply(result: int, right: int) -> int | None:
+    # Operands are positive, so multiplying by 0 never needs undoing
+    if not right:
+        return None
+    left, remainder = divmod(result, right)
+    return None if remainder else left
 
+
+def _undo_concatenate(result: int, right: int) -> int | None:
+    magnitude = 10
+    while magnitude <= right:
+        magnitude *= 10
+    left, suffix = divmod(result, magnitude)
+    return left if suffix == right else None
+
+
+OPERATORS = {
+    operator.symbol: operator
+    for operator in (
+        Operator("+", _undo_add),
+        Operator("*", _undo_multiply),
+        Operator("||", _undo_concatenate),
+    )
+}
+
+
+def _parse_file(filename: str) -> list[Equation]:
+    return list(_read_records(filename))
+
+
+def _read_records(filename: str) -> typing.Iterator[Equation]:
+    for line in inputs.stream(filename):
+        test_value, *operands = inputs.ints(line)
+        yield test_value, operands
+
+
+def _sum_valid_test_values(
+    equations: typing.Iterable[Equation],
+    operators: tuple[Operator, ...],
+) -> int:
+    find_equation = functools.partial(_find_valid_equation, operators=operators)
+    found_equations = parallel.imap(find_equation, equations, chunksize=16)
+    return sum(test_value for test_value, equation in found_equations if equation is not None)
+
+
+def _find_valid_equation(
+    equation: Equation,
+    operators: tuple[Operator, ...],
+) -> tuple[int, list[str] | None]:
+    test_value, operands = equation
+    found_operators = _find_operators(test_value, operands, len(operands), operators)
+    if found_operators is None:
+        return test_value, None
+    possible_equation = [str(operands[0])]
+    for operator, operand in zip(found_operators, operands[1:]):
+        possible_equation.extend((operator.symbol, str(operand)))
+    return test_value, possible_equation
+
+
+def _find_operators(
+    result: int,
+    operands: list[int],
+    count: int,
+    operators: tuple[Operator, ...],
+) -> list[Operator] | None:
+    """Return operators combining the first `count` operands into `result`, or None.
+
+    Works back from the last operand: only the operators which can be undone
+    from `result` are followed, which prunes most branches immediately.
+    """
+    if count == 1:
+        return [] if result == operands[0] else None
     for operator in operators:
-        for remaining in _permute(operators, length - 1):
-            yield (operator, *remaining)
+        left = operator.undo(result, operands[count - 1])
+        if left is None:
+            continue
+        if (found := _find_operators(left, operands, count - 1, operators)) is not None:
+            found.append(operator)
+            return found
+    return None
 
 
-def _interleave(iter_1: typing.Iterable, iter_2: typing.Iterable) -> typing.Iterable:
-    flattened = []
-    for pair in itertools.zip_longest(iter_1, iter_2):
-        for val in pair:
-            if val:
-                flattened.append(val)
-    return flattened
+def _part_1(equations: typing.Iterable[Equation]) -> int:
+    return _sum_valid_test_values(equations, operators=(OPERATORS["+"], OPERATORS["*"]))
 
 
-def _evaluates(equation: list[str], result: int) -> bool:
-    total = int(equation[0])
-    for operator, operand in itertools.batched(equation[1:], 2):
-        match operator:
-            case "+":
-                total += int(operand)
-            case "*":
-                total *= int(operand)
-            case "||":
-                total = int(str(total) + operand)
-    return total == result
+def _part_2(equations: typing.Iterable[Equation]) -> int:
+    operators = (OPERATORS["+"], OPERATORS["*"], OPERATORS["||"])
+    return _sum_valid_test_values(equations, operators=operators)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
     args = parser.parse_args()
 
-    equations = _parse_file(args.filename)
-    valid_equations = _validate_equations(equations, operators=("+", "*"))
-    print(f"Sum of test values with valid equations (using +, *): {sum(valid_equations.keys())}")
-
-    valid_equations = _validate_equations(equations, operators=("+", "*", "||"))
-    print(
-        f"Sum of test values with valid equations (using +, *, ||): {sum(valid_equations.keys())}"
-    )
+    if args.stream:
+        equations = inputs.Stream(_read_records, args.filename)
+    else:
+        equations = _parse_file(args.filename)
+    print(f"Sum of test values with valid equations (using +, *): {_part_1(equations)}")
+    print(f"Sum of test values with valid equations (using +, *, ||): {_part_2(equations)}")
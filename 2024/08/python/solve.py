@@ -1,6 +1,12 @@
 import argparse
 import collections
-import itertools
+
+import numpy as np
+
+from aoc import inputs
+
+# Antenna pairs whose antinodes are computed in one set of arrays
+PAIR_BATCH_SIZE = 1 << 18
 
 
 class Map:
@@ -8,9 +14,9 @@ class Map:
         self.width = 0
         self.height = 0
         self.antennas = collections.defaultdict(list)
-        self.antinodes = collections.defaultdict(list)
         self.has_harmonics = has_harmonics
         self._detect_antennas(raw_grid)
+        self.antinodes = np.zeros((self.height, self.width), dtype=bool)
         self._infer_antinodes()
 
     def _detect_antennas(self, raw_grid: str):
@@ -22,42 +28,40 @@ class Map:
                     self.antennas[frequency].append((row_index, column_index))
 
     def _infer_antinodes(self):
-        def _add_vector(coordinates: tuple[int, ...], vector: tuple[int, ...]) -> tuple[int, ...]:
-            return tuple(sum(_) for _ in zip(coordinates, vector))
-
-        def _in_map(coordinates: tuple[int, ...]) -> bool:
-            return 0 <= coordinates[0] < self.width and 0 <= coordinates[1] < self.height
-
-        for frequency, antennas in self.antennas.items():
-            for a1, a2 in itertools.combinations(antennas, 2):
-                row_diff = a1[0] - a2[0]
-                column_diff = a1[1] - a2[1]
-
-                a1_vector = (row_diff, column_diff)
-                a2_vector = (-row_diff, -column_diff)
-
-                if self.has_harmonics:
-                    for start_node, vector in [(a1, a1_vector), (a2, a2_vector)]:
-                        antinode = start_node
-                        while _in_map(antinode):
-                            self.antinodes[frequency].append(antinode)
-                            antinode = _add_vector(antinode, vector)
-                else:
-                    if _in_map(antinode_1 := _add_vector(a1, a1_vector)):
-                        self.antinodes[frequency].append(antinode_1)
-                    if _in_map(antinode_2 := _add_vector(a2, a2_vector)):
-                        self.antinodes[frequency].append(antinode_2)
+        # Every ordered pair of same-frequency antennas casts antinodes from its
+        # first antenna, away from the second. Pairs are built as arrays, a batch
+        # of first antennas at a time so memory stays bounded for large frequencies.
+        for antennas in self.antennas.values():
+            positions = np.array(antennas, dtype=np.int64)
+            batch_size = max(1, PAIR_BATCH_SIZE // len(positions))
+            for start in range(0, len(positions), batch_size):
+                origins = positions[start : start + batch_size, np.newaxis]  # noqa: E203
+                vectors = origins - positions[np.newaxis]
+                is_pair = vectors.any(axis=2)
+                origins = np.broadcast_to(origins, vectors.shape)[is_pair]
+                self._mark_antinodes(origins, vectors[is_pair])
+
+    def _mark_antinodes(self, origins: np.ndarray, vectors: np.ndarray):
+        size = np.array(self.antinodes.shape)
+        if not self.has_harmonics:
+            antinodes = origins + vectors
+            antinodes = antinodes[((antinodes >= 0) & (antinodes < size)).all(axis=1)]
+            self.antinodes[antinodes[:, 0], antinodes[:, 1]] = True
+            return
+
+        # How many multiples of each vector (including 0) stay within the map along both axes
+        room = np.where(vectors > 0, size - 1 - origins, origins)
+        steps = np.where(vectors, room // np.maximum(np.abs(vectors), 1), size.max())
+        counts = steps.min(axis=1) + 1
+        multiples = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        antinodes = np.repeat(origins, counts, axis=0)
+        antinodes += multiples[:, np.newaxis] * np.repeat(vectors, counts, axis=0)
+        self.antinodes[antinodes[:, 0], antinodes[:, 1]] = True
 
     def __str__(self):
-        rendered_rows = []
-        for row_index in range(self.height):
-            rendered_row = ["."] * self.width
-            rendered_rows.append(rendered_row)
-
-        for antinodes in self.antinodes.values():
-            for row, column in antinodes:
-                rendered_rows[row][column] = "#"
-
+        rendered_rows = [
+            ["#" if is_antinode else "." for is_antinode in row] for row in self.antinodes
+        ]
         for frequency, antennas in self.antennas.items():
             for row, column in antennas:
                 rendered_rows[row][column] = frequency
@@ -66,9 +70,16 @@ class Map:
 
 
 def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw_grid = f.read()
-    return raw_grid
+    with inputs.mapped(filename) as data:
+        return inputs.text(data)
+
+
+def _part_1(raw_map: str) -> int:
+    return int(Map(raw_map).antinodes.sum())
+
+
+def _part_2(raw_map: str) -> int:
+    return int(Map(raw_map, has_harmonics=True).antinodes.sum())
 
 
 if __name__ == "__main__":
@@ -77,10 +88,5 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     raw_map = _parse_file(args.filename)
-    map_ = Map(raw_map)
-    antinodes = itertools.chain(*map_.antinodes.values())
-    print(f"Antinode #: {len(set(antinodes))}")
-
-    map_ = Map(raw_map, has_harmonics=True)
-    antinodes = itertools.chain(*map_.antinodes.values())
-    print(f"Antinode #: {len(set(antinodes))}")
+    print(f"Antinode #: {_part_1(raw_map)}")
+    print(f"Antinode #: {_part_2(raw_map)}")
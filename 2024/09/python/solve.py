@@ -1,83 +1,105 @@
 import argparse
+import heapq
 import typing
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw = f.read().strip()
-    return raw
+ZERO = ord("0")
 
+Run: typing.TypeAlias = tuple[int, int]
 
-def _expand_map(dense_disk_map: str) -> list[int | str]:
-    expanded = []
-    file_id = 0
-    is_free = False
-    for block_count in dense_disk_map:
-        if is_free:
-            expanded += ["."] * int(block_count)
+
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(next(inputs.lines(data), b""))
+
+
+def _read_runs(dense_disk_map: bytes) -> tuple[list[Run], list[Run]]:
+    """Split the dense map into file runs (indexed by file id) and free runs, as `(start, length)`
+    pairs.
+    """
+    files = []
+    free_spans = []
+    position = 0
+    for index, digit in enumerate(dense_disk_map):
+        length = digit - ZERO
+        if not index % 2:
+            files.append((position, length))
+        elif free_spans and sum(free_spans[-1]) == position:
+            # Only an empty file separates this span from the previous one
+            free_spans[-1] = (free_spans[-1][0], free_spans[-1][1] + length)
         else:
-            expanded += [file_id] * int(block_count)
-            file_id += 1
-        is_free = not is_free
-    return expanded
-
-
-def _compact(disk_map: list[int | str]):
-    def _free_block_indexes(disk_map: list[int | str]) -> typing.Iterator[int]:
-        for i in range(len(disk_map)):
-            if disk_map[i] == ".":
-                yield i
-
-    free_block_indexes = _free_block_indexes(disk_map)
-    for i in range(len(disk_map) - 1, -1, -1):
-        if disk_map[i] != ".":
-            empty_block = next(free_block_indexes)
-            if empty_block > i:
-                break
-            disk_map[empty_block] = disk_map[i]
-            disk_map[i] = "."
-
-
-def _compact_nofrag(disk_map: list[int | str]):
-    def _file_block_ranges(disk_map: list[int | str]) -> typing.Iterator[tuple[int, int]]:
-        file_id = disk_map[-1]
-        end_block = len(disk_map) - 1
-        start_block = end_block
-        while start_block >= 0:
-            if disk_map[start_block - 1] != file_id or start_block == 0:
-                yield (start_block, end_block)
-                end_block = start_block - 1
-                while disk_map[end_block] == ".":
-                    end_block -= 1
-                file_id = disk_map[end_block]
-                start_block = end_block + 1
-            start_block -= 1
-
-    def _find_empty_space(size: int) -> tuple[int, int] | None:
-        start_block = disk_map.index(".")
-        end_block = start_block
-        while end_block < len(disk_map):
-            if disk_map[end_block] != ".":
-                start_block = disk_map[end_block:].index(".") + end_block
-                end_block = start_block
-            elif end_block - start_block + 1 == size:
-                return (start_block, end_block)
-            else:
-                end_block += 1
-        return None
-
-    for file_start_block, file_end_block in _file_block_ranges(disk_map):
-        size = file_end_block - file_start_block + 1
-        empty_blocks = _find_empty_space(size)
-        if empty_blocks and empty_blocks[1] < file_start_block:
-            disk_map[empty_blocks[0] : empty_blocks[1] + 1] = disk_map[
-                file_start_block : file_end_block + 1
-            ]
-            disk_map[file_start_block : file_end_block + 1] = ["."] * size
-
-
-def _get_checksum(disk_map: list[str | int]) -> int:
-    return sum(position * file_id for position, file_id in enumerate(disk_map) if file_id != ".")
+            free_spans.append((position, length))
+        position += length
+    return files, free_spans
+
+
+def _run_checksum(file_id: int, start: int, length: int) -> int:
+    # Sum of `position * file_id` over `start <= position < start + length`
+    return file_id * (length * start + length * (length - 1) // 2)
+
+
+def _compact(files: list[Run], free_spans: list[Run]) -> int:
+    """Return the checksum once blocks are moved one at a time from the end of the disk to its
+    leftmost free block, as runs of blocks between a free span and the last file.
+    """
+    remaining = [length for _, length in files]
+    last = len(files) - 1
+    checksum = 0
+    for free_start, free_length in free_spans:
+        while free_length and last >= 0 and files[last][0] > free_start:
+            moved = min(free_length, remaining[last])
+            checksum += _run_checksum(last, free_start, moved)
+            free_start += moved
+            free_length -= moved
+            remaining[last] -= moved
+            if not remaining[last]:
+                last -= 1
+        if last < 0 or files[last][0] < free_start:
+            break
+    for file_id in range(last + 1):
+        checksum += _run_checksum(file_id, files[file_id][0], remaining[file_id])
+    return checksum
+
+
+def _compact_nofrag(files: list[Run], free_spans: list[Run]) -> int:
+    """Return the checksum once each file, last first, is moved to the leftmost free span it fits.
+
+    Free spans are indexed by length, in one min-heap of starts per length:
+    the leftmost span fitting a file is the earliest of the heads of the heaps
+    for its length and up. Spans vacated by moved files are never reused, since
+    they lie right of every file left to move.
+    """
+    spans_by_length = [[] for _ in range(max((length for _, length in free_spans), default=0) + 1)]
+    for start, length in free_spans:
+        spans_by_length[length].append(start)
+    for spans in spans_by_length:
+        heapq.heapify(spans)
+
+    checksum = 0
+    for file_id in range(len(files) - 1, -1, -1):
+        start, length = files[file_id]
+        fitting = (
+            (spans[0], span_length)
+            for span_length, spans in enumerate(spans_by_length[length:], start=length)
+            if spans
+        )
+        if length and (found := min(fitting, default=None)) and found[0] < start:
+            free_start, free_length = found
+            heapq.heappop(spans_by_length[free_length])
+            if free_length > length:
+                heapq.heappush(spans_by_length[free_length - length], free_start + length)
+            start = free_start
+        checksum += _run_checksum(file_id, start, length)
+    return checksum
+
+
+def _part_1(dense_disk_map: bytes) -> int:
+    return _compact(*_read_runs(dense_disk_map))
+
+
+def _part_2(dense_disk_map: bytes) -> int:
+    return _compact_nofrag(*_read_runs(dense_disk_map))
 
 
 if __name__ == "__main__":
@@ -86,12 +108,5 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     dense_disk_map = _parse_file(args.filename)
-    disk_map = _expand_map(dense_disk_map)
-    _compact(disk_map)
-    checksum = _get_checksum(disk_map)
-    print(f"Compacted checksum: {checksum}")
-
-    disk_map = _expand_map(dense_disk_map)
-    _compact_nofrag(disk_map)
-    checksum = _get_checksum(disk_map)
-    print(f"Compacted, unfragmented checksum: {checksum}")
+    print(f"Compacted checksum: {_part_1(dense_disk_map)}")
+    print(f"Compacted, unfragmented checksum: {_part_2(dense_disk_map)}")
@@ -1,104 +1,96 @@
 import argparse
-import collections
-import dataclasses
+import functools
+import operator
 import typing
 
+from aoc import inputs
+from aoc.grid import Grid
+
 
-@dataclasses.dataclass
 class Map:
-    width: int = 0
-    height: int = 0
-    grid: list[list[int]] = dataclasses.field(default_factory=list)
-
-    def __init__(self, raw_map: str):
-        self.grid = []
-        for raw_row in raw_map.split("\n"):
-            self.width = max(self.width, len(raw_row))
-            row = [int(c) for c in raw_row]
-            self.grid.append(row)
-        self.height = len(self.grid)
-
-    def __getitem__(self, key):
-        if isinstance(key, tuple) and len(key) == 2:
-            return self.grid[key[0]][key[1]]
-        return self.grid.__getitem__(key)
+    def __init__(self, raw_map: bytes, trailhead: str = "0", peak: str = "9"):
+        # Elevations are byte values, so any consecutive range of characters
+        # can describe a map taller than 9.
+        self.grid = Grid.from_buffer(raw_map)
+        self.trailhead = trailhead
+        self.peak = peak
+
+    @property
+    def width(self) -> int:
+        return self.grid.width
+
+    @property
+    def height(self) -> int:
+        return self.grid.height
+
+    def __getitem__(self, key) -> int:
+        return int(self.grid[key])
 
     def __str__(self):
-        return "\n".join(("".join(str(p) for p in row)) for row in self.grid)
-
-    def trailheads(self) -> typing.Iterator[tuple[int, int]]:
-        for row_index, row in enumerate(self.grid):
-            for column_index, position in enumerate(row):
-                if position == 0:
-                    yield (row_index, column_index)
-
-    def find_trails(self) -> list[list[tuple[int, int]]]:
-        all_trails = []
-        for trailhead in self.trailheads():
-            trails, _ = self._find_trails(trailhead)
-            all_trails.extend(trails)
-        return all_trails
-
-    def _find_trails(self, position: tuple[int, int]) -> tuple[list[tuple[int, int]], bool]:
-        def _is_next(neighbor: tuple[int, int]) -> bool:
-            if 0 <= neighbor[0] < self.height and 0 <= neighbor[1] < self.width:
-                current_elevation = self[position]
-                neighbor_elevation = self[neighbor]
-                return current_elevation == neighbor_elevation - 1
-            return False
-
-        if self[position] == 9:
-            return [[position]], True
-
-        row, column = position
-        neighbors = [
-            (row - 1, column),
-            (row, column - 1),
-            (row, column + 1),
-            (row + 1, column),
-        ]
-        next_positions = filter(_is_next, neighbors)
-
-        all_trails = []
-        any_complete = False
-        for next_position in next_positions:
-            trails, is_complete = self._find_trails(next_position)
-            if not is_complete:
-                continue
-
-            any_complete = True
-            for i, trail in enumerate(trails):
-                trails[i] = [position] + trail
-            all_trails.extend(trails)
-
-        return all_trails, any_complete
-
-
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return raw.strip()
+        return str(self.grid)
+
+    def scores(self) -> dict[int, int]:
+        """Return the number of peaks reachable from each trailhead reaching any."""
+        # A trailhead's peaks are at most `climb` steps away, so no two of them
+        # are `2 * climb + 1` rows or columns apart: numbering peaks by their
+        # position modulo that keeps bitsets small however many peaks there are.
+        climb = ord(self.peak) - ord(self.trailhead)
+        period = 2 * climb + 1
+        peaks = {}
+        for index in self.grid.find_all(self.peak):
+            row, column = self.grid.position(index)
+            peaks[index] = 1 << (row % period * period + column % period)
+        reachable_peaks = self._descend(peaks, _union)
+        return {trailhead: peaks.bit_count() for trailhead, peaks in reachable_peaks.items()}
+
+    def ratings(self) -> dict[int, int]:
+        """Return the number of distinct trails from each trailhead reaching any peak."""
+        return self._descend(dict.fromkeys(self.grid.find_all(self.peak), 1), sum)
+
+    def _descend(
+        self,
+        values: dict[int, int],
+        combine: typing.Callable[[typing.Iterable[int]], int],
+    ) -> dict[int, int]:
+        """Carry `values` from the peaks down to the trailheads, one elevation at a time.
+
+        Each cell's value combines those of its neighbors one step higher; cells
+        from which no peak can be reached (a value of 0) are dropped. Only one
+        elevation is held at once, and no trail is ever built.
+        """
+        offsets = self.grid.orthogonal_offsets
+        for elevation in range(ord(self.peak) - 1, ord(self.trailhead) - 1, -1):
+            values = {
+                index: value
+                for index in self.grid.find_all(chr(elevation))
+                if (value := combine(values.get(index + offset, 0) for offset in offsets))
+            }
+        return values
+
+
+def _union(bitsets: typing.Iterable[int]) -> int:
+    return functools.reduce(operator.or_, bitsets, 0)
+
+
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(data)
+
+
+def _part_1(raw_map: bytes, peak: str = "9") -> int:
+    return sum(Map(raw_map, peak=peak).scores().values())
+
+
+def _part_2(raw_map: bytes, peak: str = "9") -> int:
+    return sum(Map(raw_map, peak=peak).ratings().values())
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--peak", default="9", help="character of the highest elevation")
     args = parser.parse_args()
 
-    raw = _parse_file(args.filename)
-    map_ = Map(raw)
-
-    reachable_peaks = collections.defaultdict(set)
-    trails = map_.find_trails()
-    for trail in trails:
-        trailhead = trail[0]
-        peak = trail[-1]
-        reachable_peaks[trailhead].add(peak)
-    scores = {trailhead: len(peaks) for trailhead, peaks in reachable_peaks.items()}
-    print(f"Sum of all trailhead scores: {sum(scores.values())}")
-
-    ratings = collections.defaultdict(int)
-    for trail in trails:
-        trailhead = trail[0]
-        ratings[trailhead] += 1
-    print(f"Sum of all trailhead ratings: {sum(ratings.values())}")
+    raw_map = _parse_file(args.filename)
+    print(f"Sum of all trailhead scores: {_part_1(raw_map, peak=args.peak)}")
+    print(f"Sum of all trailhead ratings: {_part_2(raw_map, peak=args.peak)}")
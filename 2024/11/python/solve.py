@@ -1,56 +1,79 @@
 import argparse
+import bisect
 import collections
+import functools
+import typing
 
+from aoc import inputs
 
-known_blinks = collections.defaultdict(dict)
+# Enough for the stones the rules produce from small ones, grown for larger stones
+POWERS_OF_TEN = [10**exponent for exponent in range(40)]
+TRANSITION_CACHE_SIZE = 1 << 16
 
 
 def _parse_file(filename: str) -> list[int]:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return [int(d) for d in raw.strip().split()]
+    with inputs.mapped(filename) as data:
+        return inputs.ints(data)
 
 
-def _get_next_value(stone: int):
+@functools.lru_cache(maxsize=TRANSITION_CACHE_SIZE)
+def _get_next_value(stone: int) -> tuple[int, ...]:
     if stone == 0:
-        return [1]
-    elif len(str_stone := str(stone)) % 2 == 0:
-        half_index = len(str_stone) // 2
-        new_value_1 = int(str_stone[:half_index])
-        new_value_2 = int(str_stone[half_index:])
-        return [new_value_1, new_value_2]
+        return (1,)
+    while stone >= POWERS_OF_TEN[-1]:
+        POWERS_OF_TEN.append(POWERS_OF_TEN[-1] * 10)
+    # The number of powers of ten not above the stone is its number of digits
+    if (digits := bisect.bisect_right(POWERS_OF_TEN, stone)) % 2 == 0:
+        return divmod(stone, POWERS_OF_TEN[digits // 2])
     else:
-        return [stone * 2024]
+        return (stone * 2024,)
 
 
-def _blink(stone: int, count: int) -> list[int]:
-    if count == 0:
-        return 0
-    elif known_length := known_blinks.get(stone, {}).get(count):
-        return known_length
+def _count_stones(stones: typing.Iterable[int], blinks: typing.Iterable[int]) -> dict[int, int]:
+    """Return the number of stones after each of `blinks`, blinking once up to the largest.
 
-    next_value = _get_next_value(stone)
-    if count == 1:
-        known_blinks[stone][count] = len(next_value)
-        return len(next_value)
-    else:
-        length = sum(_blink(value, count - 1) for value in next_value)
-        known_blinks[stone][count] = length
-        return length
+    Stones with the same value evolve the same way, so each generation is a
+    `Counter` of values: its size stays bounded by the number of distinct
+    values, however many stones there are.
+    """
+    blinks = set(blinks)
+    generation = collections.Counter(stones)
+    counts = {0: generation.total()} if 0 in blinks else {}
+    for blink in range(1, max(blinks, default=0) + 1):
+        next_generation = collections.Counter()
+        for stone, count in generation.items():
+            for next_stone in _get_next_value(stone):
+                next_generation[next_stone] += count
+        generation = next_generation
+        if blink in blinks:
+            counts[blink] = generation.total()
+    return counts
+
+
+def _part_1(stones: list[int]) -> int:
+    return _count_stones(stones, [25])[25]
+
+
+def _part_2(stones: list[int]) -> int:
+    return _count_stones(stones, [75])[75]
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument(
+        "-b",
+        "--blinks",
+        type=int,
+        nargs="+",
+        help="report the number of stones after each of these blinks instead",
+    )
     args = parser.parse_args()
 
     stones = _parse_file(args.filename)
-    stone_count = 0
-    for stone in stones:
-        stone_count += _blink(stone, 25)
-    print(f"Number of stones after 25 blinks: {stone_count}")
-
-    stone_count = 0
-    for stone in stones:
-        stone_count += _blink(stone, 75)
-    print(f"Number of stones after 75 blinks: {stone_count}")
+    if args.blinks:
+        for blinks, count in sorted(_count_stones(stones, args.blinks).items()):
+            print(f"Number of stones after {blinks} blinks: {count}")
+    else:
+        print(f"Number of stones after 25 blinks: {_part_1(stones)}")
+        print(f"Number of stones after 75 blinks: {_part_2(stones)}")
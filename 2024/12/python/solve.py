@@ -1,151 +1,126 @@
 import argparse
 import dataclasses
-import enum
 
+import numpy as np
 
-class Direction(enum.Enum):
-    LEFT = "left"
-    RIGHT = "right"
-    UP = "up"
-    DOWN = "down"
+from aoc import inputs
+from aoc.grid import Grid
 
 
 @dataclasses.dataclass
-class Region:
-    plots: list["Plot"] = dataclasses.field(default_factory=list)
+class Regions:
+    """Every region of a map, as arrays indexed by region label."""
 
-    def __add__(self, other):
-        region = Region(plots=self.plots + other.plots)
-        return region
-
-    def __getitem__(self, key) -> "Plot":
-        if isinstance(key, tuple) and len(key) == 2:
-            return self.plots[key[0]][key[1]]
-        return self.plots.__getitem__(key)
+    labels: np.ndarray
+    areas: np.ndarray
+    perimeters: np.ndarray
+    side_counts: np.ndarray
 
     def price_fencing(self, is_bulk: bool = False) -> int:
         if is_bulk:
-            cost = self.area * self.side_count
+            costs = self.areas * self.side_counts
         else:
-            cost = self.area * self.perimeter
-        return cost
-
-    @property
-    def area(self) -> int:
-        return len(self.plots)
-
-    @property
-    def perimeter(self) -> int:
-        perimeter = 0
-        for plot in self.plots:
-            possible_neighbors = (
-                Plot(row=plot.row - 1, column=plot.column, value=plot.value),
-                Plot(row=plot.row + 1, column=plot.column, value=plot.value),
-                Plot(row=plot.row, column=plot.column - 1, value=plot.value),
-                Plot(row=plot.row, column=plot.column + 1, value=plot.value),
-            )
-            for neighbor in possible_neighbors:
-                if neighbor not in self.plots:
-                    perimeter += 1
-        return perimeter
-
-    @property
-    def side_count(self) -> int:
-        count = 0
-        for plot in self.plots:
-            for side in Direction:
-                match side:
-                    case Direction.LEFT:
-                        plot_across = Plot(plot.row, plot.column - 1, plot.value)
-                        old_neighbor = Plot(plot.row - 1, plot.column, plot.value)
-                        across_old_neighbor = Plot(plot.row - 1, plot.column - 1, plot.value)
-                    case Direction.RIGHT:
-                        plot_across = Plot(plot.row, plot.column + 1, plot.value)
-                        old_neighbor = Plot(plot.row - 1, plot.column, plot.value)
-                        across_old_neighbor = Plot(plot.row - 1, plot.column + 1, plot.value)
-                    case Direction.UP:
-                        plot_across = Plot(plot.row - 1, plot.column, plot.value)
-                        old_neighbor = Plot(plot.row, plot.column - 1, plot.value)
-                        across_old_neighbor = Plot(plot.row - 1, plot.column - 1, plot.value)
-                    case Direction.DOWN:
-                        plot_across = Plot(plot.row + 1, plot.column, plot.value)
-                        old_neighbor = Plot(plot.row, plot.column - 1, plot.value)
-                        across_old_neighbor = Plot(plot.row + 1, plot.column - 1, plot.value)
-
-                is_edge = plot_across not in self.plots
-                already_counted = (
-                    old_neighbor in self.plots and across_old_neighbor not in self.plots
-                )
-                if is_edge and not already_counted:
-                    count += 1
-        return count
-
-
-@dataclasses.dataclass
-class Plot:
-    row: int
-    column: int
-    value: str
-    region: Region = None
-
-    def __eq__(self, other: "Plot"):
-        return self.row == other.row and self.column == other.column and self.value == self.value
-
-    def __repr__(self):
-        return f"{self.value} ({self.row},{self.column})"
-
-
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return raw.strip()
-
-
-def _build_map(raw_map: str) -> list[list[Plot]]:
-    map_ = []
-    for row_index, raw_row in enumerate(raw_map.split("\n")):
-        row = []
-        for column_index, raw_plot in enumerate(raw_row):
-            plot = Plot(
-                row=row_index,
-                column=column_index,
-                value=raw_plot,
-            )
-            row.append(plot)
-        map_.append(row)
-    return map_
-
-
-def _detect_regions(map_: list[list[Plot]]) -> list[Region]:
-    regions = []
-    for row_index, row in enumerate(map_):
-        for column_index, plot in enumerate(row):
-            region = None
-            if column_index > 0:
-                neighbor_left = map_[row_index][column_index - 1]
-                if neighbor_left.value == plot.value:
-                    region = neighbor_left.region
-            if row_index > 0:
-                neighbor_up = map_[row_index - 1][column_index]
-                if neighbor_up.value == plot.value and neighbor_up.region != region:
-                    if not region:
-                        region = neighbor_up.region
-                    else:
-                        regions.remove(neighbor_left.region)
-                        regions.remove(neighbor_up.region)
-                        region = neighbor_left.region + neighbor_up.region
-                        for old_plot in region.plots:
-                            map_[old_plot.row][old_plot.column].region = region
-                        regions.append(region)
-
-            if region:
-                plot.region = region
-                region.plots.append(plot)
-            else:
-                region = Region(plots=[plot])
-                plot.region = region
-                regions.append(region)
-    return regions
+            costs = self.areas * self.perimeters
+        return int(costs.sum())
+
+
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(data)
+
+
+def _build_map(raw_map: bytes) -> Grid:
+    return Grid.from_buffer(raw_map)
+
+
+def _detect_regions(map_: Grid) -> Regions:
+    labels = _label_plots(map_)
+    plants = np.frombuffer(map_.cells, dtype=np.uint8).reshape(-1, map_.stride)
+    perimeters, side_counts = _count_edges(plants, map_.padding, map_.height, map_.width)
+    return Regions(
+        labels=labels,
+        areas=np.bincount(labels.ravel()),
+        perimeters=np.bincount(labels.ravel(), weights=perimeters.ravel()).astype(np.int64),
+        side_counts=np.bincount(labels.ravel(), weights=side_counts.ravel()).astype(np.int64),
+    )
+
+
+def _label_plots(map_: Grid) -> np.ndarray:
+    """Return a `height` x `width` array numbering each plot's region from 0."""
+    # Union-find over cell indexes: each plot joins the regions of its left and
+    # up neighbors growing the same plant. The map's border never matches a
+    # plant, so edge plots need no special case.
+    cells = map_.cells
+    parents = list(range(len(cells)))
+
+    def _find(index: int) -> int:
+        while (parent := parents[index]) != index:
+            parents[index] = index = parents[parent]
+        return index
+
+    for plot in map_.indexes():
+        for offset in (map_.offset(0, -1), map_.offset(-1, 0)):
+            if cells[plot + offset] == cells[plot]:
+                root_1, root_2 = _find(plot), _find(plot + offset)
+                if root_1 != root_2:
+                    parents[max(root_1, root_2)] = min(root_1, root_2)
+
+    # Finish flattening every path at once, then renumber roots consecutively
+    roots = np.array(parents)
+    while not np.array_equal(grandparents := roots[roots], roots):
+        roots = grandparents
+    padding = map_.padding
+    roots = roots.reshape(-1, map_.stride)[
+        padding : padding + map_.height, padding : padding + map_.width  # noqa: E203
+    ]
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels.reshape(roots.shape)
+
+
+def _count_edges(
+    plants: np.ndarray,
+    padding: int,
+    height: int,
+    width: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return each plot's number of fence edges and region corners, comparing whole shifted
+    views of the padded `plants` at once.
+
+    Plots growing the same plant are in the same region when adjacent, so a
+    plant change is a region boundary. A region has as many sides as corners.
+    """
+
+    def _shifted(row_delta: int, column_delta: int) -> np.ndarray:
+        top, left = padding + row_delta, padding + column_delta
+        return plants[top : top + height, left : left + width]  # noqa: E203
+
+    plot = _shifted(0, 0)
+    differs = {
+        (row_delta, column_delta): _shifted(row_delta, column_delta) != plot
+        for row_delta in (-1, 0, 1)
+        for column_delta in (-1, 0, 1)
+    }
+    perimeters = sum(
+        differs[delta].astype(np.int64) for delta in ((-1, 0), (0, 1), (1, 0), (0, -1))
+    )
+
+    side_counts = np.zeros((height, width), dtype=np.int64)
+    for vertical in (-1, 1):
+        for horizontal in (-1, 1):
+            across_vertical = differs[vertical, 0]
+            across_horizontal = differs[0, horizontal]
+            outer = across_vertical & across_horizontal
+            inner = ~across_vertical & ~across_horizontal & differs[vertical, horizontal]
+            side_counts += outer | inner
+    return perimeters, side_counts
+
+
+def _part_1(raw_map: bytes) -> int:
+    return _detect_regions(_build_map(raw_map)).price_fencing()
+
+
+def _part_2(raw_map: bytes) -> int:
+    return _detect_regions(_build_map(raw_map)).price_fencing(is_bulk=True)
 
 
 if __name__ == "__main__":
@@ -153,11 +128,6 @@ if __name__ == "__main__":
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    raw = _parse_file(args.filename)
-    map_ = _build_map(raw)
-    regions = _detect_regions(map_)
-    price = sum(region.price_fencing() for region in regions)
-    print(f"Total price of fencing: {price}")
-
-    bulk_price = sum(region.price_fencing(is_bulk=True) for region in regions)
-    print(f"Total price of bulk fencing: {bulk_price}")
+    raw_map = _parse_file(args.filename)
+    print(f"Total price of fencing: {_part_1(raw_map)}")
+    print(f"Total price of bulk fencing: {_part_2(raw_map)}")
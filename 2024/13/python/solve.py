@@ -1,62 +1,122 @@
 import argparse
-import dataclasses
-import re
-
-
-@dataclasses.dataclass
-class Button:
-    x_diff: int
-    y_diff: int
-
-
-@dataclasses.dataclass
-class ClawGame:
-    a: Button
-    b: Button
-    prize: tuple[int, int]
-
-    def solve(self) -> tuple[tuple[int, int], int]:
-        # Cramer's rule
-        determinant = self.a.x_diff * self.b.y_diff - self.a.y_diff * self.b.x_diff
-        determinant_a = self.prize[0] * self.b.y_diff - self.prize[1] * self.b.x_diff
-        determinant_b = self.a.x_diff * self.prize[1] - self.a.y_diff * self.prize[0]
-        a_presses = int(determinant_a / determinant)
-        b_presses = int(determinant_b / determinant)
-
-        if (
-            a_presses * self.a.x_diff + b_presses * self.b.x_diff == self.prize[0]
-            and a_presses * self.a.y_diff + b_presses * self.b.y_diff == self.prize[1]
-        ):
-            tokens = 3 * a_presses + b_presses
-        else:
-            a_presses = b_presses = tokens = None
-        return ((a_presses, b_presses), tokens)
-
-
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    return _build_games(raw)
-
-
-def _build_games(raw: str) -> list[ClawGame]:
-    games = []
-    pattern = (
-        r"Button A: X\+(?P<a_x>\d+), Y\+(?P<a_y>\d+)\n"
-        r"Button B: X\+(?P<b_x>\d+), Y\+(?P<b_y>\d+)\n"
-        r"Prize: X=(?P<prize_x>\d+), Y=(?P<prize_y>\d+)"
-    )
-    for raw_game in raw.split("\n\n"):
-        if not (m := re.match(pattern, raw_game)):
-            raise ValueError("Cannot parse game format")
-        game = ClawGame(
-            a=Button(int(m.group("a_x")), int(m.group("a_y"))),
-            b=Button(int(m.group("b_x")), int(m.group("b_y"))),
-            prize=(int(m.group("prize_x")), int(m.group("prize_y"))),
-        )
-        games.append(game)
-    return games
+import math
+
+import numpy as np
+
+from aoc import arrays, inputs
+
+A_COST = 3
+B_COST = 1
+PRIZE_OFFSET = 10000000000000
+INT64_MAX = np.iinfo(np.int64).max
+# Cramer's rule multiplies two input values, then subtracts two such products
+PRODUCT_LIMIT = INT64_MAX // 2
+
+
+def _parse_file(filename: str) -> np.ndarray:
+    """Return one row per machine: A's X and Y, B's X and Y, then the prize's X and Y.
+
+    Values too large for int64 are kept as Python ints, in an object array.
+    """
+    with inputs.mapped(filename) as data:
+        try:
+            numbers = arrays.ints(data, signed=False)
+        except OverflowError:
+            numbers = np.array(inputs.ints(data, signed=False), dtype=object)
+    if len(numbers) % 6:
+        raise ValueError("Cannot parse game format")
+    return numbers.reshape(-1, 6)
+
+
+def _count_tokens(machines: np.ndarray) -> int:
+    """Return the fewest tokens winning every prize that can be won.
+
+    Machines are solved all at once with exact integer arithmetic on int64
+    arrays, unless the products of their values are large enough to overflow;
+    those, and the machines whose buttons move the claw along the same line,
+    are solved one by one with Python ints.
+    """
+    buttons = np.abs(machines[:, :4]).max(axis=1, initial=0)
+    values = np.maximum(buttons, np.abs(machines[:, 4:]).max(axis=1, initial=0))
+    fits = buttons <= PRODUCT_LIMIT // np.maximum(values, 1)
+    a_x, a_y, b_x, b_y, prize_x, prize_y = machines[fits].astype(np.int64).T
+    determinant = a_x * b_y - a_y * b_x
+    is_collinear = determinant == 0
+    divisor = np.where(is_collinear, 1, determinant)
+    a_presses, a_remainder = np.divmod(prize_x * b_y - prize_y * b_x, divisor)
+    b_presses, b_remainder = np.divmod(a_x * prize_y - a_y * prize_x, divisor)
+    wins = ~is_collinear & (a_remainder == 0) & (b_remainder == 0)
+    wins &= (a_presses >= 0) & (b_presses >= 0)
+    tokens = sum((A_COST * a_presses[wins] + B_COST * b_presses[wins]).tolist())
+
+    unsolved = np.concatenate((machines[~fits], machines[fits][is_collinear]))
+    for machine in unsolved.tolist():
+        if (machine_tokens := _solve(*machine)) is not None:
+            tokens += machine_tokens
+    return tokens
+
+
+def _solve(a_x: int, a_y: int, b_x: int, b_y: int, prize_x: int, prize_y: int) -> int | None:
+    """Return the fewest tokens winning a single machine's prize, or None if it cannot be won."""
+    determinant = a_x * b_y - a_y * b_x
+    if not determinant:
+        return _solve_collinear(a_x, a_y, b_x, b_y, prize_x, prize_y)
+
+    a_presses, a_remainder = divmod(prize_x * b_y - prize_y * b_x, determinant)
+    b_presses, b_remainder = divmod(a_x * prize_y - a_y * prize_x, determinant)
+    if a_remainder or b_remainder or a_presses < 0 or b_presses < 0:
+        return None
+    return A_COST * a_presses + B_COST * b_presses
+
+
+def _solve_collinear(
+    a_x: int,
+    a_y: int,
+    b_x: int,
+    b_y: int,
+    prize_x: int,
+    prize_y: int,
+) -> int | None:
+    # Both buttons move along one line: the prize must be on it, then the
+    # presses only need to add up along one axis (any axis they move along).
+    if not (a_x or a_y or b_x or b_y):
+        return None if prize_x or prize_y else 0
+    if a_x * prize_y != a_y * prize_x or b_x * prize_y != b_y * prize_x:
+        return None
+    a_step, b_step, target = (a_x, b_x, prize_x) if a_x or b_x else (a_y, b_y, prize_y)
+    if not a_step or not b_step:
+        step, cost = (a_step, A_COST) if a_step else (b_step, B_COST)
+        presses, remainder = divmod(target, step)
+        return None if remainder or presses < 0 else cost * presses
+
+    # Every solution of `a * a_step + b * b_step == target` is some base
+    # solution shifted by multiples of (b_step, -a_step) / gcd; the cost
+    # changes linearly with the shift, so the cheapest is at one end of the
+    # range keeping both press counts non-negative.
+    divisor = math.gcd(a_step, b_step)
+    if target % divisor:
+        return None
+    a_shift, b_shift = b_step // divisor, a_step // divisor
+    # The smallest non-negative count of A presses leaving a multiple of `b_step`
+    a_base = target // divisor * pow(b_shift, -1, a_shift) % a_shift if a_shift > 1 else 0
+    b_base, remainder = divmod(target - a_base * a_step, b_step)
+    if remainder or b_base < 0:
+        return None
+    # Each shift trades `b_shift` B presses for `a_shift` more A presses
+    shifts = b_base // b_shift if A_COST * a_shift < B_COST * b_shift else 0
+    return A_COST * (a_base + shifts * a_shift) + B_COST * (b_base - shifts * b_shift)
+
+
+def _part_1(machines: np.ndarray) -> int:
+    return _count_tokens(machines)
+
+
+def _part_2(machines: np.ndarray) -> int:
+    if machines.dtype != object and machines[:, 4:].max(initial=0) > INT64_MAX - PRIZE_OFFSET:
+        machines = machines.astype(object)
+    converted_machines = machines.copy()
+    converted_machines[:, 4:] += PRIZE_OFFSET
+    return _count_tokens(converted_machines)
 
 
 if __name__ == "__main__":
@@ -64,11 +124,6 @@ if __name__ == "__main__":
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    games = _parse_file(args.filename)
-    tokens = sum(game.solve()[1] or 0 for game in games)
-    print(f"Tokens necessary to win all possible prizes: {tokens}")
-
-    for game in games:
-        game.prize = (game.prize[0] + 10000000000000, game.prize[1] + 10000000000000)
-    tokens = sum(game.solve()[1] or 0 for game in games)
-    print(f"Tokens necessary to win all possible prizes (with conversion): {tokens}")
+    machines = _parse_file(args.filename)
+    print(f"Tokens necessary to win all possible prizes: {_part_1(machines)}")
+    print(f"Tokens necessary to win all possible prizes (with conversion): {_part_2(machines)}")
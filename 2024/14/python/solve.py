@@ -3,42 +3,76 @@ import dataclasses
 import math
 import re
 
+import numpy as np
 
-@dataclasses.dataclass
-class Robot:
-    x: int
-    y: int
-    velocity: tuple[int, int]
+from aoc import arrays, inputs
 
 
 @dataclasses.dataclass
 class Map:
+    # One row per robot, as (x, y)
+    positions: np.ndarray
+    velocities: np.ndarray
     width: int = 101
     height: int = 103
-    robots: list[Robot] = dataclasses.field(default_factory=list)
+
+    @property
+    def size(self) -> np.ndarray:
+        return np.array((self.width, self.height))
+
+    def at(self, seconds: int) -> "Map":
+        """Return the map after `seconds`, computed directly from the initial positions."""
+        positions = (self.positions + self.velocities * seconds) % self.size
+        return dataclasses.replace(self, positions=positions)
 
     @property
     def safety_factor(self) -> int:
         half_x = self.width // 2
         half_y = self.height // 2
-        quandrant_count = [0, 0, 0, 0]
-        for robot in self.robots:
-            if robot.x < half_x and robot.y < half_y:
-                quandrant_count[0] += 1
-            elif robot.x > half_x and robot.y < half_y:
-                quandrant_count[1] += 1
-            elif robot.x < half_x and robot.y > half_y:
-                quandrant_count[2] += 1
-            elif robot.x > half_x and robot.y > half_y:
-                quandrant_count[3] += 1
-        return math.prod(quandrant_count)
-
-    def tick(self):
-        for robot in self.robots:
-            robot.x = (robot.x + robot.velocity[0]) % self.width
-            robot.y = (robot.y + robot.velocity[1]) % self.height
-
-    def is_tree(self):
+        x, y = self.positions.T
+        quadrant_counts = [
+            np.count_nonzero(is_left & is_top)
+            for is_left in (x < half_x, x > half_x)
+            for is_top in (y < half_y, y > half_y)
+        ]
+        return math.prod(quadrant_counts)
+
+    def find_easter_egg(self) -> int:
+        """Return the first second at which the robots draw a tree.
+
+        Robots bunch up in a picture, so the spread of their x coordinates is
+        smallest at some point of its `width`-second cycle, and that of their y
+        coordinates at some point of its `height`-second cycle. By the Chinese
+        remainder theorem, each second of the combined cycle is one such pair of
+        points: seconds are checked for a tree (rendering a single frame each)
+        from the least spread out, so the picture is usually the first one. Any
+        earlier second not checked yet is then checked in order, in case the
+        pattern also shows in a frame which is more spread out.
+        """
+        variances_x = self._get_variances(axis=0, period=self.width)
+        variances_y = self._get_variances(axis=1, period=self.height)
+        seconds = np.arange(math.lcm(self.width, self.height))
+        spreads = variances_x[seconds % self.width] + variances_y[seconds % self.height]
+        order = np.argsort(spreads, kind="stable").tolist()
+        for rank, second in enumerate(order):
+            if self.at(second).is_tree():
+                break
+        else:
+            raise ValueError("Robots never draw a tree")
+
+        checked = set(order[:rank])
+        for earlier in range(second):
+            if earlier not in checked and self.at(earlier).is_tree():
+                return earlier
+        return second
+
+    def _get_variances(self, axis: int, period: int) -> np.ndarray:
+        """Return the variance of the robots' coordinates along `axis` at each second."""
+        seconds = np.arange(period)[:, np.newaxis]
+        coordinates = (self.positions[:, axis] + self.velocities[:, axis] * seconds) % period
+        return coordinates.var(axis=1)
+
+    def is_tree(self) -> bool:
         pattern = (
             f"1.{{{self.width - 1}}}"
             f"1{{{3}}}.{{{self.width - 3}}}"
@@ -46,53 +80,53 @@ class Map:
             f"1{{{7}}}.{{{self.width - 7}}}"
             f"1{{{9}}}.{{{self.width - 9}}}"
         )
-        return bool(re.search(pattern, str(self), re.DOTALL))
+        # Only tiles with a single robot can be part of the tree, so the frame
+        # is rendered as bytes marking those alone.
+        frame = np.full((self.height, self.width + 1), ord("."), dtype=np.uint8)
+        frame[:, -1] = ord("\n")
+        frame[:, :-1][self._count_robots() == 1] = ord("1")
+        return bool(re.search(pattern.encode(), frame.tobytes(), re.DOTALL))
+
+    def _count_robots(self) -> np.ndarray:
+        x, y = self.positions.T
+        counts = np.bincount(y * self.width + x, minlength=self.width * self.height)
+        return counts.reshape(self.height, self.width)
 
     def __str__(self):
-        positions = [[0] * self.width for _ in range(self.height)]
-        for robot in self.robots:
-            positions[robot.y][robot.x] += 1
         return "\n".join(
-            "".join("." if position == 0 else str(position) for position in row)
-            for row in positions
+            "".join("." if count == 0 else str(count) for count in row)
+            for row in self._count_robots().tolist()
         )
 
 
 def _parse_file(filename: str) -> Map:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    return _build_map(raw.strip())
-
-
-def _build_map(raw: str) -> Map:
-    robots = []
-    pattern = r"p=(?P<x>\d+),(?P<y>\d+) v=(?P<x_diff>-?\d+),(?P<y_diff>-?\d+)"
-    for raw_robot in raw.split("\n"):
-        if not (m := re.match(pattern, raw_robot)):
-            raise ValueError(f"Cannot parse robot format: {raw_robot}")
-        robot = Robot(
-            x=int(m.group("x")),
-            y=int(m.group("y")),
-            velocity=(int(m.group("x_diff")), int(m.group("y_diff"))),
-        )
-        robots.append(robot)
-    return Map(robots=robots)
+    with inputs.mapped(filename) as data:
+        return _build_map(arrays.ints(data))
+
+
+def _build_map(numbers: np.ndarray) -> Map:
+    if len(numbers) % 4:
+        raise ValueError("Cannot parse robot format")
+    robots = numbers.reshape(-1, 4)
+    return Map(positions=robots[:, :2], velocities=robots[:, 2:])
+
+
+def _part_1(map_: Map) -> int:
+    return map_.at(100).safety_factor
+
+
+def _part_2(map_: Map) -> int:
+    return map_.find_easter_egg()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--show", action="store_true", help="print the easter egg")
     args = parser.parse_args()
 
     map_ = _parse_file(args.filename)
-    for _ in range(100):
-        map_.tick()
-    print(f"Safety factor after 100s: {map_.safety_factor}")
-
-    map_ = _parse_file(args.filename)
-    seconds = 0
-    while not map_.is_tree():
-        map_.tick()
-        seconds += 1
-    print(f"Seconds until easter egg: {seconds}")
+    print(f"Safety factor after 100s: {_part_1(map_)}")
+    print(f"Seconds until easter egg: {(seconds := _part_2(map_))}")
+    if args.show:
+        print(map_.at(seconds))
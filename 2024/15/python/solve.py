@@ -1,209 +1,159 @@
 import argparse
-import dataclasses
+import itertools
+
+from aoc import inputs
+from aoc.grid import ARROWS, Grid
+
+WALL = ord("#")
+BOX = ord("O")
+BOX_LEFT = ord("[")
+BOX_RIGHT = ord("]")
+FLOOR = ord(".")
+ROBOT = ord("@")
 
 
-@dataclasses.dataclass
 class Map:
-    robot: tuple[int, int] = None
-    grid: list[list[str]] = dataclasses.field(default_factory=list)
+    robot: int
+    grid: Grid
 
-    def __init__(self, raw_map: str):
-        self.grid = []
-        for row_index, raw_row in enumerate(raw_map.split("\n")):
-            row = list(raw_row)
-            self.grid.append(row)
-            if "@" in row:
-                self.robot = (row_index, row.index("@"))
+    def __init__(self, raw_map: bytes):
+        self.grid = Grid.from_buffer(raw_map, border="#")
+        self.robot = self.grid.find("@")
+        self._offsets = dict(zip(ARROWS, self.grid.orthogonal_offsets))
 
     def __str__(self):
-        return "\n".join("".join(row) for row in self.grid)
+        return str(self.grid)
 
     @property
     def height(self):
-        return len(self.grid)
+        return self.grid.height
 
     @property
     def width(self):
-        try:
-            return len(self.grid[0])
-        except IndexError:
-            return 0
+        return self.grid.width
 
     def get_box_coordinates(self):
-        for row_index, row in enumerate(self.grid):
-            for column_index, position in enumerate(row):
-                if position == "O":
-                    yield 100 * row_index + column_index
-
-    def move_robot(self, direction: str):
-        self.robot = self._move_object(self.robot[0], self.robot[1], direction, prev=".")
-
-    def _move_object(
-        self,
-        row: int,
-        column: int,
-        direction: str,
-        prev: str,
-    ) -> tuple[int, int]:
-        match direction:
-            case "<":
-                neighbor_row = row
-                neighbor_column = column - 1
-            case "^":
-                neighbor_row = row - 1
-                neighbor_column = column
-            case ">":
-                neighbor_row = row
-                neighbor_column = column + 1
-            case "v":
-                neighbor_row = row + 1
-                neighbor_column = column
-
-        if not (0 <= neighbor_row < self.height and 0 <= neighbor_column < self.width):
-            return row, column
-
-        neighbor = self.grid[neighbor_row][neighbor_column]
-        if neighbor == "#":
-            return row, column
-        elif neighbor == "O":
-            new_neighbor_position = self._move_object(
-                neighbor_row,
-                neighbor_column,
-                direction,
-                self.grid[row][column],
-            )
-            if new_neighbor_position != (neighbor_row, neighbor_column):
-                self.grid[neighbor_row][neighbor_column] = self.grid[row][column]
-                self.grid[row][column] = prev
-                new_position = neighbor_row, neighbor_column
-            else:
-                new_position = row, column
-            return new_position
-        else:
-            self.grid[neighbor_row][neighbor_column] = self.grid[row][column]
-            self.grid[row][column] = prev
-            return neighbor_row, neighbor_column
+        for index in self.grid.find_all("O"):
+            row_index, column_index = self.grid.position(index)
+            yield 100 * row_index + column_index
+
+    def run(self, directions: str):
+        """Move the robot along `directions`, one run of identical moves at a time.
+
+        The robot is lifted off the grid meanwhile, so that stepping onto floor is
+        a single lookup. A blocked move leaves the warehouse unchanged, so it would
+        stay blocked for every later move of its run: those are skipped.
+        """
+        cells = self.grid.cells
+        robot = self.robot
+        cells[robot] = FLOOR
+        for direction, moves in itertools.groupby(directions):
+            offset = self._offsets[direction]
+            for _ in moves:
+                ahead = robot + offset
+                cell = cells[ahead]
+                if cell == WALL or (cell != FLOOR and not self._push(ahead, offset)):
+                    break
+                robot = ahead
+        cells[robot] = ROBOT
+        self.robot = robot
+
+    def _push(self, index: int, offset: int) -> bool:
+        """Move the line of boxes starting at `index` by `offset`, unless it is walled in.
+
+        Shifting the line by one cell only moves its first box to the far end.
+        """
+        cells = self.grid.cells
+        end = index + offset
+        while cells[end] == BOX:
+            end += offset
+        if cells[end] == WALL:
+            return False
+        cells[end] = BOX
+        cells[index] = FLOOR
+        return True
 
 
-@dataclasses.dataclass
 class WideMap(Map):
-    robot: tuple[int, int] = None
-    grid: list[list[str]] = dataclasses.field(default_factory=list)
-
-    def __init__(self, raw_map: str):
-        self.grid = []
-        for row_index, raw_row in enumerate(raw_map.split("\n")):
-            row = []
-            for column_index, position in enumerate(raw_row):
-                match position:
-                    case "#":
-                        row.extend(["#", "#"])
-                    case "O":
-                        row.extend(["[", "]"])
-                    case ".":
-                        row.extend([".", "."])
-                    case "@":
-                        row.extend(["@", "."])
-                        self.robot = (row_index, row.index("@"))
-            self.grid.append(row)
+    def __init__(self, raw_map: bytes):
+        widened = ((b"#", b"##"), (b"O", b"[]"), (b".", b".."), (b"@", b"@."))
+        for position, wide_position in widened:
+            raw_map = raw_map.replace(position, wide_position)
+        super().__init__(raw_map)
 
     def get_box_coordinates(self):
-        for row_index, row in enumerate(self.grid):
-            for column_index, position in enumerate(row):
-                if position == "[":
-                    yield 100 * row_index + column_index
-
-    def move_robot(self, direction: str):
-        if self._can_move(self.robot[0], self.robot[1], direction):
-            self._move_object(self.robot[0], self.robot[1], direction, prev=".")
-            match direction:
-                case "<":
-                    self.robot = self.robot[0], self.robot[1] - 1
-                case "^":
-                    self.robot = self.robot[0] - 1, self.robot[1]
-                case ">":
-                    self.robot = self.robot[0], self.robot[1] + 1
-                case "v":
-                    self.robot = self.robot[0] + 1, self.robot[1]
-
-    def _can_move(self, row: int, column: int, direction: str) -> bool:
-        match direction:
-            case "<":
-                if self.grid[row][column] == "]":
-                    next_positions = [(row, column - 2)]
-                else:
-                    next_positions = [(row, column - 1)]
-            case "^":
-                next_positions = [(row - 1, column)]
-                if self.grid[row - 1][column] == "]":
-                    next_positions.append((row - 1, column - 1))
-                elif self.grid[row - 1][column] == "[":
-                    next_positions.append((row - 1, column + 1))
-            case ">":
-                if self.grid[row][column] == "[":
-                    next_positions = [(row, column + 2)]
-                else:
-                    next_positions = [(row, column + 1)]
-            case "v":
-                next_positions = [(row + 1, column)]
-                if self.grid[row + 1][column] == "]":
-                    next_positions.append((row + 1, column - 1))
-                elif self.grid[row + 1][column] == "[":
-                    next_positions.append((row + 1, column + 1))
-
-        can_move = True
-        for next_position in next_positions:
-            if self.grid[next_position[0]][next_position[1]] == "#":
-                can_move = False
-                break
-            elif self.grid[next_position[0]][next_position[1]] in ("[", "]"):
-                can_move = self._can_move(next_position[0], next_position[1], direction)
-                if not can_move:
-                    break
-        return can_move
-
-    def _move_object(
-        self,
-        row: int,
-        column: int,
-        direction: str,
-        prev: str,
-    ):
-        match direction:
-            case "<":
-                neighbors = [(row, column - 1, self.grid[row][column])]
-            case "^":
-                neighbors = [(row - 1, column, self.grid[row][column])]
-                if self.grid[row - 1][column] == "]":
-                    neighbors.append((row - 1, column - 1, "."))
-                elif self.grid[row - 1][column] == "[":
-                    neighbors.append((row - 1, column + 1, "."))
-            case ">":
-                neighbors = [(row, column + 1, self.grid[row][column])]
-            case "v":
-                neighbors = [(row + 1, column, self.grid[row][column])]
-                if self.grid[row + 1][column] == "]":
-                    neighbors.append((row + 1, column - 1, "."))
-                elif self.grid[row + 1][column] == "[":
-                    neighbors.append((row + 1, column + 1, "."))
-
-        for neighbor in neighbors:
-            neighbor_row, neighbor_column, neighbor_prev = neighbor
-            if self.grid[neighbor_row][neighbor_column] == ".":
-                self.grid[neighbor_row][neighbor_column] = neighbor_prev
-                self.grid[row][column] = prev
-            else:
-                self._move_object(neighbor_row, neighbor_column, direction, neighbor_prev)
-                self.grid[neighbor_row][neighbor_column] = neighbor_prev
-                self.grid[row][column] = prev
-
-
-def _parse_file(filename: str) -> tuple[str, str]:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    raw_map, raw_directions = raw.split("\n\n")
-    return raw_map, "".join(raw_directions.split("\n"))
+        for index in self.grid.find_all("["):
+            row_index, column_index = self.grid.position(index)
+            yield 100 * row_index + column_index
+
+    def _push(self, index: int, offset: int) -> bool:
+        if offset in (1, -1):
+            return self._push_horizontally(index, offset)
+        return self._push_vertically(index, offset)
+
+    def _push_horizontally(self, index: int, offset: int) -> bool:
+        """Shift the boxes from `index` along the row in one slice assignment."""
+        cells = self.grid.cells
+        end = index + offset
+        while cells[end] in (BOX_LEFT, BOX_RIGHT):
+            end += offset
+        if cells[end] == WALL:
+            return False
+        if offset > 0:
+            cells[index + 1 : end + 1] = cells[index:end]  # noqa: E203
+        else:
+            cells[end:index] = cells[end + 1 : index + 1]  # noqa: E203
+        cells[index] = FLOOR
+        return True
+
+    def _push_vertically(self, index: int, offset: int) -> bool:
+        """Gather the boxes pushed from `index` row by row, as a frontier of the cells moving into
+        the next row, then move them from the farthest row back.
+        """
+        cells = self.grid.cells
+        layers = []
+        frontier = [index, index + 1] if cells[index] == BOX_LEFT else [index - 1, index]
+        while frontier:
+            layers.append(frontier)
+            pushed = set()
+            for cell_index in frontier:
+                target = cell_index + offset
+                cell = cells[target]
+                if cell == WALL:
+                    return False
+                elif cell == BOX_LEFT:
+                    pushed.update((target, target + 1))
+                elif cell == BOX_RIGHT:
+                    pushed.update((target - 1, target))
+            frontier = list(pushed)
+
+        for layer in reversed(layers):
+            for cell_index in layer:
+                cells[cell_index + offset] = cells[cell_index]
+                cells[cell_index] = FLOOR
+        return True
+
+
+def _parse_file(filename: str) -> tuple[bytes, str]:
+    with inputs.mapped(filename) as data:
+        raw_map, raw_directions = inputs.records(data)
+        warehouse = bytes(raw_map), inputs.text(b"".join(inputs.lines(raw_directions)))
+        del raw_map, raw_directions
+    return warehouse
+
+
+def _part_1(warehouse: tuple[bytes, str]) -> int:
+    raw_map, directions = warehouse
+    map_ = Map(raw_map)
+    map_.run(directions)
+    return sum(map_.get_box_coordinates())
+
+
+def _part_2(warehouse: tuple[bytes, str]) -> int:
+    raw_map, directions = warehouse
+    wide_map = WideMap(raw_map)
+    wide_map.run(directions)
+    return sum(wide_map.get_box_coordinates())
 
 
 if __name__ == "__main__":
@@ -211,13 +161,6 @@ if __name__ == "__main__":
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    raw_map, directions = _parse_file(args.filename)
-    map_ = Map(raw_map)
-    for direction in directions:
-        map_.move_robot(direction)
-    print(f"Sum of boxes' GPS coordinates: {sum(map_.get_box_coordinates())}")
-
-    wide_map = WideMap(raw_map)
-    for direction in directions:
-        wide_map.move_robot(direction)
-    print(f"Sum of wide boxes' GPS coordinates: {sum(wide_map.get_box_coordinates())}")
+    warehouse = _parse_file(args.filename)
+    print(f"Sum of boxes' GPS coordinates: {_part_1(warehouse)}")
+    print(f"Sum of wide boxes' GPS coordinates: {_part_2(warehouse)}")
@@ -1,6 +1,8 @@
 import argparse
+import copy
 import dataclasses
-import re
+
+from aoc import inputs
 
 
 class Halt(Exception):
@@ -129,27 +131,20 @@ class Computer:
 
 
 def _parse_file(filename: str) -> Computer:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    return _build_computer(raw.strip())
+    with inputs.mapped(filename) as data:
+        return _build_computer(inputs.ints(data))
 
 
-def _build_computer(raw_computer: str) -> Computer:
-    pattern = (
-        r"Register A: (?P<reg_a>\d+)\s"
-        r"Register B: (?P<reg_b>\d+)\s"
-        r"Register C: (?P<reg_c>\d+)\s+"
-        r"Program: (?P<program>(\d+,)+\d)"
-    )
-    if not (match := re.search(pattern, raw_computer)):
+def _build_computer(numbers: list[int]) -> Computer:
+    if len(numbers) < 4:
         raise ValueError("Unparseable raw input")
 
+    register_a, register_b, register_c, *program = numbers
     computer = Computer(
-        register_a=int(match.group("reg_a")),
-        register_b=int(match.group("reg_b")),
-        register_c=int(match.group("reg_c")),
-        program=[int(inst) for inst in match.group("program").split(",")],
+        register_a=register_a,
+        register_b=register_b,
+        register_c=register_c,
+        program=program,
     )
     return computer
 
@@ -169,14 +164,21 @@ def _find_a(computer: Computer, instruction_index: int, guess: int = 0):
     return None
 
 
+def _part_1(computer: Computer) -> str:
+    computer = copy.deepcopy(computer)
+    computer.run()
+    return computer.output
+
+
+def _part_2(computer: Computer) -> int:
+    return _find_a(computer, len(computer.program) - 1)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
     computer = _parse_file(args.filename)
-    computer.run()
-    print(f"Expected output: {computer.output}")
-
-    register_a = _find_a(computer, len(computer.program) - 1)
-    print(f"Uncorrupted register A: {register_a}")
+    print(f"Expected output: {_part_1(computer)}")
+    print(f"Uncorrupted register A: {_part_2(computer)}")
@@ -1,33 +1,39 @@
 import argparse
 import collections
+import copy
 import dataclasses
 import math
 import queue
 import typing
 
+from aoc import inputs
+from aoc.grid import Grid
+
 Position: typing.TypeAlias = tuple[int, int]
 
+WALL = ord("#")
+
 
 @dataclasses.dataclass
 class Map:
     width: int = 71
     height: int = 71
     falls: list[Position] = dataclasses.field(default_factory=list)
-    grid: list[list[str]] = dataclasses.field(default_factory=list)
+    grid: Grid = None
 
     def __post_init__(self):
-        self.grid = [['.'] * self.width for _ in range(self.height)]
+        self.grid = Grid(self.width, self.height, border="#")
 
     def __str__(self):
-        return "\n".join("".join(row) for row in self.grid)
+        return str(self.grid)
 
     @property
-    def start(self):
-        return (0, 0)
+    def start(self) -> int:
+        return self.grid.index(0, 0)
 
     @property
-    def end(self):
-        return (self.width - 1, self.height - 1)
+    def end(self) -> int:
+        return self.grid.index(self.height - 1, self.width - 1)
 
     def tick(self) -> Position:
         try:
@@ -35,65 +41,46 @@ class Map:
         except IndexError:
             return None
 
-        self.grid[row][column] = '#'
+        self.grid[row, column] = '#'
         return (column, row)
 
-    def _is_valid(self, position: Position) -> bool:
-        return 0 <= position[0] < self.height and 0 <= position[1] < self.width
-
-    def _is_obstructed(self, position: Position) -> bool:
-        try:
-            return self.grid[position[0]][position[1]] == "#"
-        except IndexError:
-            return False
-
-    def get_neighbors(self, position: Position) -> list[tuple[Position]]:
-        row, column = position
-        possible_neighbors = (
-            (row, column - 1),
-            (row, column + 1),
-            (row - 1, column),
-            (row + 1, column),
-        )
-        return filter(
-            lambda pos: self._is_valid(pos) and not self._is_obstructed(pos),
-            possible_neighbors,
+    def get_neighbors(self, index: int) -> typing.Iterator[int]:
+        cells = self.grid.cells
+        return (
+            index + offset
+            for offset in self.grid.orthogonal_offsets
+            if cells[index + offset] != WALL
         )
 
-    def render_path(self, path: list[Position]) -> str:
-        grid = [list(row) for row in self.grid]
-        for row, column in path:
-            grid[row][column] = "O"
-        return "\n".join("".join(row) for row in grid)
+    def render_path(self, path: list[int]) -> str:
+        grid = self.grid.copy()
+        for index in path:
+            grid[index] = "O"
+        return str(grid)
 
 
 def _parse_file(filename: str) -> Map:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    return _build_map(raw.strip())
+    with inputs.mapped(filename) as data:
+        return _build_map(inputs.ints(data))
 
 
-def _build_map(raw_falls: str, width: int = 71, height: int = 71) -> Map:
-    falls = [
-        tuple([int(coordinate) for coordinate in raw_position.split(',')])
-        for raw_position in raw_falls.split('\n')
-    ]
+def _build_map(coordinates: list[int], width: int = 71, height: int = 71) -> Map:
+    falls = list(zip(coordinates[::2], coordinates[1::2]))
     return Map(width, height, falls)
 
 
 def _find_path(map_: Map):
     """A* algorithm."""
 
-    def _estimate_points(position: Position):
-        return abs(map_.end[0] - position[0]) + abs(map_.end[1] - position[1])
+    end_row, end_column = map_.grid.position(map_.end)
 
-    def _reconstruct_path(
-        came_from: dict[Position],
-        current: Position,
-    ) -> list[Position]:
+    def _estimate_points(index: int):
+        row, column = map_.grid.position(index)
+        return abs(end_row - row) + abs(end_column - column)
+
+    def _reconstruct_path(came_from: dict[int, int], current: int) -> list[int]:
         path = collections.deque([current])
-        while current := came_from.get(current):
+        while (current := came_from.get(current)) is not None:
             path.appendleft(current)
         return path
 
@@ -125,17 +112,28 @@ def _find_path(map_: Map):
     return None
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    map_ = _parse_file(args.filename)
+def _part_1(map_: Map) -> int:
+    map_ = copy.deepcopy(map_)
     for _ in range(1024):
         map_.tick()
     path = _find_path(map_)
-    print(f"Steps in path: {len(path) - 1}")
+    return len(path) - 1
+
 
+def _part_2(map_: Map) -> Position:
+    map_ = copy.deepcopy(map_)
+    for _ in range(1024):
+        fall = map_.tick()
     while _find_path(map_) is not None:
         fall = map_.tick()
-    print(f"Coordinates of fall preventing escape: {fall}")
+    return fall
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    map_ = _parse_file(args.filename)
+    print(f"Steps in path: {_part_1(map_)}")
+    print(f"Coordinates of fall preventing escape: {_part_2(map_)}")
@@ -1,38 +1,57 @@
 import argparse
 import functools
 
-PATTERNS: list[str] = []
+from aoc import inputs, instrument
 
 
-def _parse_file(filename: str) -> tuple[list[str], list[str]]:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    raw_patterns, raw_designs = raw.split("\n\n")
-    return raw_patterns.strip().split(', '), raw_designs.strip().split('\n')
+def _parse_file(filename: str) -> tuple[tuple[str, ...], list[str]]:
+    with inputs.mapped(filename) as data:
+        raw_patterns, raw_designs = inputs.records(data)
+        patterns = tuple(inputs.text(raw_patterns).strip().split(', '))
+        designs = [inputs.text(design) for design in inputs.lines(raw_designs)]
+        del raw_patterns, raw_designs
+    return patterns, designs
 
 
 @functools.cache
-def _find_patterns(design: str) -> int:
+def _find_patterns(design: str, patterns: tuple[str, ...]) -> int:
+    instrument.count("_find_patterns cache misses")
     arrangements = 0
-    for pattern in PATTERNS:
+    for pattern in patterns:
         if pattern == design:
             arrangements += 1
         elif design.startswith(pattern):
             remaining_design = design[len(pattern) :]  # noqa
-            remaining_arrangements = _find_patterns(remaining_design)
+            remaining_arrangements = _find_patterns(remaining_design, patterns)
             arrangements += remaining_arrangements
 
     return arrangements
 
 
+def _count_arrangements(designs: list[str], patterns: tuple[str, ...]) -> list[int]:
+    hits = _find_patterns.cache_info().hits
+    arrangements = [_find_patterns(design, patterns) for design in designs]
+    instrument.count("_find_patterns cache hits", _find_patterns.cache_info().hits - hits)
+    return arrangements
+
+
+def _part_1(towels: tuple[tuple[str, ...], list[str]]) -> int:
+    patterns, designs = towels
+    return len(
+        [arrangements for arrangements in _count_arrangements(designs, patterns) if arrangements]
+    )
+
+
+def _part_2(towels: tuple[tuple[str, ...], list[str]]) -> int:
+    patterns, designs = towels
+    return sum(_count_arrangements(designs, patterns))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    PATTERNS, designs = _parse_file(args.filename)
-    arrangements = {design: _find_patterns(design) for design in designs}
-    achievable_designs = [design for design, arrangements in arrangements.items() if arrangements]
-    print(f"Achievable designs #: {len(achievable_designs)}")
-    print(f"Total arrangements #: {sum(arrangements.values())}")
+    towels = _parse_file(args.filename)
+    print(f"Achievable designs #: {_part_1(towels)}")
+    print(f"Total arrangements #: {_part_2(towels)}")
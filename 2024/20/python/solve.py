@@ -4,82 +4,60 @@ import dataclasses
 import itertools
 import typing
 
+from aoc import inputs
+from aoc.grid import Grid
+from aoc.inputs import Buffer
+
 Position: typing.TypeAlias = tuple[int, int]
 
+WALL = ord("#")
+
 
 @dataclasses.dataclass
 class Map:
-    start: Position
-    end: Position
-    grid: list[list[str]] = dataclasses.field(default_factory=list)
+    start: int
+    end: int
+    grid: Grid
 
     @classmethod
-    def from_raw(cls, raw_map: str) -> 'Map':
-        start = None
-        end = None
-        grid = []
-        for row_index, raw_row in enumerate(raw_map.split('\n')):
-            row = []
-            for column_index, position in enumerate(raw_row):
-                row.append(position)
-                if position == 'S':
-                    start = (row_index, column_index)
-                elif position == 'E':
-                    end = (row_index, column_index)
-            grid.append(row)
-        return cls(start, end, grid)
+    def from_raw(cls, raw_map: Buffer) -> 'Map':
+        grid = Grid.from_buffer(raw_map, border="#")
+        return cls(grid.find('S'), grid.find('E'), grid)
 
     def __str__(self):
-        return "\n".join("".join(row) for row in self.grid)
+        return str(self.grid)
 
     @property
     def width(self) -> int:
-        try:
-            return len(self.grid[0])
-        except IndexError:
-            return 0
+        return self.grid.width
 
     @property
     def height(self):
-        return len(self.grid)
-
-    def _is_valid(self, position: Position) -> bool:
-        return 0 <= position[0] < self.height and 0 <= position[1] < self.width
-
-    def _is_wall(self, position: Position) -> bool:
-        try:
-            return self.grid[position[0]][position[1]] == "#"
-        except IndexError:
-            return False
-
-    def get_neighbors(self, position: Position) -> list[Position]:
-        row, column = position
-        possible_neighbors = (
-            (row, column - 1),
-            (row, column + 1),
-            (row - 1, column),
-            (row + 1, column),
-        )
-        return filter(
-            lambda pos: self._is_valid(pos) and not self._is_wall(pos),
-            possible_neighbors,
+        return self.grid.height
+
+    def get_neighbors(self, index: int) -> typing.Iterator[int]:
+        cells = self.grid.cells
+        return (
+            index + offset
+            for offset in self.grid.orthogonal_offsets
+            if cells[index + offset] != WALL
         )
 
 
 def _parse_file(filename: str) -> Map:
-    with open(filename, "r") as f:
-        raw = f.read()
-
-    return Map.from_raw(raw.strip())
+    with inputs.mapped(filename) as data:
+        return Map.from_raw(data)
 
 
 def _find_path(map_: Map) -> list[Position]:
     path = [map_.start]
+    visited = {map_.start}
     while path[-1] != map_.end:
         for neighbor in map_.get_neighbors(path[-1]):
-            if neighbor not in path:
+            if neighbor not in visited:
                 path.append(neighbor)
-    return path
+                visited.add(neighbor)
+    return [map_.grid.position(index) for index in path]
 
 
 def _get_cheats(
@@ -102,17 +80,23 @@ def _get_manhattan_distance(position_1: Position, position_2: Position) -> int:
     return abs(position_1[0] - position_2[0]) + abs(position_1[1] - position_2[1])
 
 
+def _part_1(map_: Map) -> int:
+    cheats = _get_cheats(map_, _find_path(map_), 2)
+    big_cheats = itertools.chain(*[c for skipped, c in cheats.items() if skipped >= 100])
+    return len(list(big_cheats))
+
+
+def _part_2(map_: Map) -> int:
+    cheats = _get_cheats(map_, _find_path(map_), 20)
+    big_cheats = itertools.chain(*[c for skipped, c in cheats.items() if skipped >= 100])
+    return len(list(big_cheats))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
     map_ = _parse_file(args.filename)
-    path = _find_path(map_)
-    cheats = _get_cheats(map_, path, 2)
-    big_cheats = itertools.chain(*[c for skipped, c in cheats.items() if skipped >= 100])
-    print(f"Number of 2-step cheats skipping 100+ steps: {len(list(big_cheats))}")
-
-    cheats = _get_cheats(map_, path, 20)
-    big_cheats = itertools.chain(*[c for skipped, c in cheats.items() if skipped >= 100])
-    print(f"Number of 20-step cheats skipping 100+ steps: {len(list(big_cheats))}")
+    print(f"Number of 2-step cheats skipping 100+ steps: {_part_1(map_)}")
+    print(f"Number of 20-step cheats skipping 100+ steps: {_part_2(map_)}")
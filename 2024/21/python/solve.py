@@ -3,14 +3,14 @@ import functools
 import itertools
 import typing
 
+from aoc import inputs
+
 Position: typing.TypeAlias = tuple[int, int]
 
 
 def _parse_file(filename: str) -> list[str]:
-    with open(filename, "r") as f:
-        raw = f.read().strip()
-
-    return raw.split('\n')
+    with inputs.mapped(filename) as data:
+        return [inputs.text(line) for line in inputs.lines(data)]
 
 
 def _prepopulate_paths(rows: list[str]):
@@ -75,24 +75,26 @@ def _calculate_complexity(code: str, directions_count: str) -> int:
     return directions_count * int(code.rstrip('A'))
 
 
+def _sum_complexities(codes: list[str], keypads: int) -> int:
+    direction_counts = {
+        code: _press_keypad(code, depth=keypads, is_numpad_starter=True) for code in codes
+    }
+    return sum(_calculate_complexity(code, count) for code, count in direction_counts.items())
+
+
+def _part_1(codes: list[str]) -> int:
+    return _sum_complexities(codes, 3)
+
+
+def _part_2(codes: list[str]) -> int:
+    return _sum_complexities(codes, 26)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
     codes = _parse_file(args.filename)
-    direction_counts = {
-        code: _press_keypad(code, depth=3, is_numpad_starter=True) for code in codes
-    }
-    complexities = sum(
-        _calculate_complexity(code, count) for code, count in direction_counts.items()
-    )
-    print(f"Sum of code complexities with 3 keypads: {complexities}")
-
-    direction_counts = {
-        code: _press_keypad(code, depth=26, is_numpad_starter=True) for code in codes
-    }
-    complexities = sum(
-        _calculate_complexity(code, count) for code, count in direction_counts.items()
-    )
-    print(f"Sum of code complexities with 26 keypads: {complexities}")
+    print(f"Sum of code complexities with 3 keypads: {_part_1(codes)}")
+    print(f"Sum of code complexities with 26 keypads: {_part_2(codes)}")
@@ -1,12 +1,19 @@
 import argparse
 import collections
+import functools
 import typing
 
+from aoc import inputs, parallel
 
-def _parse_file(filename: str) -> str:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return raw.strip()
+
+def _parse_file(filename: str) -> list[int]:
+    with inputs.mapped(filename) as data:
+        return inputs.ints(data)
+
+
+def _read_records(filename: str) -> typing.Iterator[int]:
+    for line in inputs.stream(filename):
+        yield int(line)
 
 
 def _get_secret_numbers(secret: int) -> typing.Iterator[int]:
@@ -34,10 +41,19 @@ def _get_nth_secret(seller: int, n: int) -> int:
     return secret
 
 
-def _get_price_sequences(sellers: list[int]) -> dict[tuple[int, int, int, int], int]:
-    sequence_seller_values = collections.defaultdict(dict)
+def _get_price_sequences(sellers: typing.Iterable[int]) -> dict[tuple[int, int, int, int], int]:
+    sequence_total_values = collections.Counter()
+    batches = parallel.chunks(sellers, 500)
+    for batch_values in parallel.imap(_get_batch_price_sequences, batches):
+        sequence_total_values.update(batch_values)
+    return sequence_total_values
+
+
+def _get_batch_price_sequences(sellers: list[int]) -> dict[tuple[int, int, int, int], int]:
+    sequence_total_values = collections.Counter()
     for seller in sellers:
         secrets = _get_secret_numbers(seller)
+        seen_sequences = set()
 
         # Discard the first three prices to build history.
         last_price = seller % 10
@@ -55,25 +71,32 @@ def _get_price_sequences(sellers: list[int]) -> dict[tuple[int, int, int, int],
             price = secret % 10
             price_change = price - last_price
             price_change_history = price_change_history[1:] + (price_change,)
-            if seller not in sequence_seller_values[price_change_history]:
-                sequence_seller_values[price_change_history][seller] = price
+            if price_change_history not in seen_sequences:
+                seen_sequences.add(price_change_history)
+                sequence_total_values[price_change_history] += price
             last_price = price
 
-    sequence_total_values = {
-        sequence: sum(sellers.values()) for sequence, sellers in sequence_seller_values.items()
-    }
     return sequence_total_values
 
 
+def _part_1(sellers: typing.Iterable[int]) -> int:
+    get_secret = functools.partial(_get_nth_secret, n=2000)
+    return sum(parallel.imap(get_secret, sellers, chunksize=1000))
+
+
+def _part_2(sellers: typing.Iterable[int]) -> int:
+    return max(_get_price_sequences(sellers).values())
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
     args = parser.parse_args()
 
-    raw = _parse_file(args.filename)
-    sellers = [int(seller) for seller in raw.split('\n')]
-    secrets = {seller: _get_nth_secret(seller, 2000) for seller in sellers}
-    print(f"Sum 2000th secret numbers: {sum(secrets.values())}")
-
-    sequence_values = _get_price_sequences(sellers)
-    print(f"Maximum bananas: {max(sequence_values.values())}")
+    if args.stream:
+        sellers = inputs.Stream(_read_records, args.filename)
+    else:
+        sellers = _parse_file(args.filename)
+    print(f"Sum 2000th secret numbers: {_part_1(sellers)}")
+    print(f"Maximum bananas: {_part_2(sellers)}")
@@ -1,17 +1,19 @@
 import argparse
 import collections
 import itertools
+import typing
+
+from aoc import inputs
 
 
 def _parse_file(filename: str) -> dict[str, list[str]]:
-    with open(filename, "r") as f:
-        raw = f.read()
-    return _build_edges(raw.strip())
+    with inputs.mapped(filename) as data:
+        return _build_edges(inputs.text(line) for line in inputs.lines(data))
 
 
-def _build_edges(raw_edges: str) -> dict[str, set[str]]:
+def _build_edges(raw_edges: typing.Iterable[str]) -> dict[str, set[str]]:
     edges = collections.defaultdict(set)
-    for edge in raw_edges.split('\n'):
+    for edge in raw_edges:
         value_1, value_2 = edge.split('-')
         edges[value_1].add(value_2)
         edges[value_2].add(value_1)
@@ -52,19 +54,25 @@ def _get_connected_components(edges: dict[str, list[str]]) -> list[set[str]]:
     return components
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    edges = _parse_file(args.filename)
+def _part_1(edges: dict[str, set[str]]) -> int:
     cliques_3 = _get_cliques(edges)
     cliques_3_with_t = [
         clique for clique in cliques_3 if any(node.startswith('t') for node in clique)
     ]
-    print(f"Sets of 3 with a 't' node: {len(cliques_3_with_t)}")
+    return len(cliques_3_with_t)
+
 
+def _part_2(edges: dict[str, set[str]]) -> str:
     components = _get_connected_components(edges)
     lan_party = max(components, key=len)
-    password = ','.join(sorted(list(lan_party)))
-    print(f"Password to LAN party: {password}")
+    return ','.join(sorted(list(lan_party)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    edges = _parse_file(args.filename)
+    print(f"Sets of 3 with a 't' node: {_part_1(edges)}")
+    print(f"Password to LAN party: {_part_2(edges)}")
@@ -1,8 +1,11 @@
 import argparse
+import copy
 import dataclasses
 import re
 import typing
 
+from aoc import inputs
+
 
 @dataclasses.dataclass
 class Wire:
@@ -19,9 +22,8 @@ class Gate:
 
 
 def _parse_file(filename: str) -> dict[str, list[str]]:
-    with open(filename, "r") as f:
-        raw = f.read().strip()
-    return _build_circuit(*raw.split('\n\n'))
+    with inputs.mapped(filename) as data:
+        return _build_circuit(*(inputs.text(record) for record in inputs.records(data)))
 
 
 def _build_circuit(raw_wires: str, raw_gates: str) -> dict[str, Wire]:
@@ -117,15 +119,23 @@ def _find_incorrect_wires(wires: dict[str, Wire]):
     return problem_wires
 
 
+def _part_1(wires: dict[str, Wire]) -> int:
+    wires = copy.deepcopy(wires)
+    _run_circuit(wires)
+    circuit_output = _extract_labelled(wires, "z")
+    return int(circuit_output, 2)
+
+
+def _part_2(wires: dict[str, Wire]) -> str:
+    bad_wires = _find_incorrect_wires(wires)
+    return ','.join(sorted(list(bad_wires)))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
     wires = _parse_file(args.filename)
-    _run_circuit(wires)
-    circuit_output = _extract_labelled(wires, "z")
-    print(f"Circuit output: {int(circuit_output, 2)}")
-
-    bad_wires = _find_incorrect_wires(wires)
-    print(f"Swapped output wires: {','.join(sorted(list(bad_wires)))}")
+    print(f"Circuit output: {_part_1(wires)}")
+    print(f"Swapped output wires: {_part_2(wires)}")
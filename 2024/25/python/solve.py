@@ -2,31 +2,35 @@ import argparse
 import itertools
 import typing
 
+from aoc import inputs
+from aoc.inputs import Buffer
+
 Key: typing.TypeAlias = list[int]
 Lock: typing.TypeAlias = list[int]
 
+PIN = ord("#")
+
 
 def _parse_file(filename: str) -> tuple[list[Key], list[Lock]]:
-    with open(filename, "r") as f:
-        raw = f.read().strip()
-    return _build_schematics(raw.split('\n\n'))
+    with inputs.mapped(filename) as data:
+        return _build_schematics(inputs.records(data))
 
 
-def _build_schematics(raw_schematics: list[str]) -> tuple[list[Lock], list[Key]]:
+def _build_schematics(raw_schematics: typing.Iterable[Buffer]) -> tuple[list[Lock], list[Key]]:
     keys = []
     locks = []
     for schematic in raw_schematics:
-        rows = schematic.split("\n")
+        rows = list(inputs.lines(schematic))
 
         final = [-1] * len(rows[0])
         for row in rows:
             for i, column in enumerate(row):
-                if column == "#":
+                if column == PIN:
                     final[i] += 1
 
-        if all(c == "#" for c in rows[0]):
+        if all(c == PIN for c in rows[0]):
             locks.append(final)
-        elif all(c == "#" for c in rows[-1]):
+        elif all(c == PIN for c in rows[-1]):
             keys.append(final)
         else:
             raise ValueError("Schematic is neither lock nor key")
@@ -42,11 +46,15 @@ def _find_non_overlap(locks: list[Lock], keys: list[Key]) -> list[tuple[Lock, Ke
     return matches
 
 
+def _part_1(schematics: tuple[list[Lock], list[Key]]) -> int:
+    locks, keys = schematics
+    return len(_find_non_overlap(locks, keys))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    locks, keys = _parse_file(args.filename)
-    matches = _find_non_overlap(locks, keys)
-    print(f"Unique key/lock pairs: {len(matches)}")
+    schematics = _parse_file(args.filename)
+    print(f"Unique key/lock pairs: {_part_1(schematics)}")
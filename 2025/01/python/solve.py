@@ -1,10 +1,16 @@
 import argparse
+import typing
+
+from aoc import inputs
 
 
 def _parse_file(filename: str) -> list[str]:
-    with open(filename) as f:
-        lines = f.readlines()
-    return lines
+    return list(_read_records(filename))
+
+
+def _read_records(filename: str) -> typing.Iterator[str]:
+    for line in inputs.stream(filename):
+        yield inputs.text(line)
 
 
 def _rotate_dial(current_position: int, instruction: str) -> int:
@@ -29,21 +35,18 @@ def _rotate_dial_with_count(current_position: int, instruction: str) -> int:
     return next_position, passes_zero
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    instructions = _parse_file(args.filename)
+def _part_1(instructions: typing.Iterable[str]) -> int:
     current_position = 50
-    combination = []
+    zeros = 0
     for instruction in instructions:
         current_position = _rotate_dial(current_position, instruction)
-        combination.append(current_position % 100)
-    print(f"Number of 0s in combination: {combination.count(0)}")
+        zeros += current_position % 100 == 0
+    return zeros
 
+
+def _part_2(instructions: typing.Iterable[str]) -> int:
     current_position = 50
-    combination = []
+    zeros = 0
     passes_zero = 0
     for instruction in instructions:
         current_position, new_passes_zero = _rotate_dial_with_count(
@@ -51,5 +54,19 @@ if __name__ == "__main__":
             instruction,
         )
         passes_zero += new_passes_zero
-        combination.append(current_position)
-    print(f"Number of 0s while dialing: {passes_zero + combination.count(0)}")
+        zeros += current_position == 0
+    return passes_zero + zeros
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
+    args = parser.parse_args()
+
+    if args.stream:
+        instructions = inputs.Stream(_read_records, args.filename)
+    else:
+        instructions = _parse_file(args.filename)
+    print(f"Number of 0s in combination: {_part_1(instructions)}")
+    print(f"Number of 0s while dialing: {_part_2(instructions)}")
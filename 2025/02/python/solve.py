@@ -1,16 +1,13 @@
 import argparse
 import itertools
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> list[tuple[int, int]]:
-    with open(filename) as f:
-        line = f.read().strip("\n")
 
-    ranges = []
-    for product_range in line.split(","):
-        start, end = product_range.split("-")
-        ranges.append((int(start), int(end)))
-    return ranges
+def _parse_file(filename: str) -> list[tuple[int, int]]:
+    with inputs.mapped(filename) as data:
+        bounds = inputs.ints(data, signed=False)
+    return list(zip(bounds[::2], bounds[1::2]))
 
 
 def _find_invalid_ids_part_1(start: int, end: int):
@@ -36,20 +33,25 @@ def _find_invalid_ids_part_2(start: int, end: int):
                 break
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    ranges = _parse_file(args.filename)
+def _part_1(ranges: list[tuple[int, int]]) -> int:
     bad_product_ids = itertools.chain.from_iterable(
         _find_invalid_ids_part_1(start, end) for start, end in ranges
     )
-    result = sum(bad_product_ids)
-    print(f"Sum of invalid IDs: {result}")
+    return sum(bad_product_ids)
+
 
+def _part_2(ranges: list[tuple[int, int]]) -> int:
     bad_product_ids = itertools.chain.from_iterable(
         _find_invalid_ids_part_2(start, end) for start, end in ranges
     )
-    result = sum(bad_product_ids)
-    print(f"Sum of invalid IDs: {result}")
+    return sum(bad_product_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    ranges = _parse_file(args.filename)
+    print(f"Sum of invalid IDs: {_part_1(ranges)}")
+    print(f"Sum of invalid IDs: {_part_2(ranges)}")
@@ -1,10 +1,17 @@
 import argparse
+import functools
+import typing
+
+from aoc import inputs, parallel
 
 
 def _parse_file(filename: str) -> list[str]:
-    with open(filename) as f:
-        banks = f.readlines()
-    return [bank.strip("\n") for bank in banks]
+    return list(_read_records(filename))
+
+
+def _read_records(filename: str) -> typing.Iterator[str]:
+    for bank in inputs.stream(filename):
+        yield inputs.text(bank)
 
 
 def _get_max_joltage(bank: str, batteries: int) -> int:
@@ -20,14 +27,28 @@ def _get_max_joltage(bank: str, batteries: int) -> int:
     return int(joltage)
 
 
+def _get_total_joltage(banks: typing.Iterable[str], batteries: int) -> int:
+    get_joltage = functools.partial(_get_max_joltage, batteries=batteries)
+    return sum(parallel.imap(get_joltage, banks, chunksize=10000))
+
+
+def _part_1(banks: typing.Iterable[str]) -> int:
+    return _get_total_joltage(banks, 2)
+
+
+def _part_2(banks: typing.Iterable[str]) -> int:
+    return _get_total_joltage(banks, 12)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
     args = parser.parse_args()
 
-    banks = _parse_file(args.filename)
-    joltages = (_get_max_joltage(bank, 2) for bank in banks)
-    print(f"Total joltage with 2 batteries: {sum(joltages)}")
-
-    joltages = (_get_max_joltage(bank, 12) for bank in banks)
-    print(f"Total joltage with 12 batteries: {sum(joltages)}")
+    if args.stream:
+        banks = inputs.Stream(_read_records, args.filename)
+    else:
+        banks = _parse_file(args.filename)
+    print(f"Total joltage with 2 batteries: {_part_1(banks)}")
+    print(f"Total joltage with 12 batteries: {_part_2(banks)}")
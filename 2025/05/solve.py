@@ -1,22 +1,21 @@
 import argparse
-import re
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> tuple[list[tuple[int]], list[int]]:
-    with open(filename) as f:
-        raw = f.read().strip("\n")
-    raw_ranges, ids = raw.split("\n\n")
 
-    ranges = []
-    for raw_range in raw_ranges.split("\n"):
-        match = re.match(r"(\d+)-(\d+)", raw_range)
-        ranges.append(tuple(int(m) for m in match.groups()))
-    return ranges, [int(id_) for id_ in ids.split("\n")]
+def _parse_file(filename: str) -> tuple[list[tuple[int]], list[int]]:
+    with inputs.mapped(filename) as data:
+        raw_ranges, ids = inputs.records(data)
+        bounds = inputs.ints(raw_ranges, signed=False)
+        ranges = list(zip(bounds[::2], bounds[1::2]))
+        ids = inputs.ints(ids)
+        del raw_ranges
+    return ranges, ids
 
 
 def _get_fresh_ingredients(
     fresh_ranges: list[tuple[int]],
-    available_indients: list[int],
+    available_ingredients: list[int],
 ) -> set[int]:
     fresh = set()
     for ingredient in available_ingredients:
@@ -39,7 +38,7 @@ def _count_ids(ranges: list[tuple[int]]) -> int:
 
 
 def _merge_ranges(ranges: list[tuple[int]]) -> list[tuple[int]]:
-    ranges.sort(key=lambda r: r[0])
+    ranges = sorted(ranges, key=lambda r: r[0])
     new_ranges = [ranges[0]]
     for range_ in ranges[1:]:
         prev = new_ranges[-1]
@@ -51,14 +50,21 @@ def _merge_ranges(ranges: list[tuple[int]]) -> list[tuple[int]]:
     return new_ranges
 
 
+def _part_1(inventory: tuple[list[tuple[int]], list[int]]) -> int:
+    fresh_ranges, available_ingredients = inventory
+    return len(_get_fresh_ingredients(fresh_ranges, available_ingredients))
+
+
+def _part_2(inventory: tuple[list[tuple[int]], list[int]]) -> int:
+    fresh_ranges, _ = inventory
+    return _count_ids(fresh_ranges)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    fresh_ranges, available_ingredients = _parse_file(args.filename)
-    fresh_ingredients = _get_fresh_ingredients(fresh_ranges, available_ingredients)
-    print(f"{len(fresh_ingredients)} available ingredients are fresh")
-
-    fresh_id_count = _count_ids(fresh_ranges)
-    print(f"{fresh_id_count} ingredient IDs are considered fresh")
+    inventory = _parse_file(args.filename)
+    print(f"{_part_1(inventory)} available ingredients are fresh")
+    print(f"{_part_2(inventory)} ingredient IDs are considered fresh")
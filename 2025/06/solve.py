@@ -2,10 +2,13 @@ import argparse
 import math
 import re
 
+from aoc import inputs
+
 
 def _parse_file(filename: str) -> tuple[list[str], list[str]]:
-    with open(filename) as f:
-        raw_lines = f.readlines()
+    with inputs.mapped(filename) as data:
+        # Keep line endings: they terminate the last column of the worksheet
+        raw_lines = inputs.text(data).splitlines(keepends=True)
     operations = raw_lines.pop().split()
     return raw_lines, operations
 
@@ -50,16 +53,23 @@ def _do_math(numbers: list[int], operation: str) -> int:
     return result
 
 
+def _part_1(worksheet: tuple[list[str], list[str]]) -> int:
+    raw_numbers, operations = worksheet
+    columns = _parse_by_group(raw_numbers)
+    return sum(_do_math(numbers, operation) for numbers, operation in zip(columns, operations))
+
+
+def _part_2(worksheet: tuple[list[str], list[str]]) -> int:
+    raw_numbers, operations = worksheet
+    columns = _parse_by_column(raw_numbers)
+    return sum(_do_math(numbers, operation) for numbers, operation in zip(columns, operations))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
-    raw_numbers, operations = _parse_file(args.filename)
-    columns = _parse_by_group(raw_numbers)
-    result = sum(_do_math(numbers, operation) for numbers, operation in zip(columns, operations))
-    print(f"Sum of all individual problems: {result}")
-
-    columns = _parse_by_column(raw_numbers)
-    result = sum(_do_math(numbers, operation) for numbers, operation in zip(columns, operations))
-    print(f"Sum of all individual columnar problems: {result}")
+    worksheet = _parse_file(args.filename)
+    print(f"Sum of all individual problems: {_part_1(worksheet)}")
+    print(f"Sum of all individual columnar problems: {_part_2(worksheet)}")
@@ -1,70 +1,72 @@
 import argparse
-import collections
 
+from aoc import inputs
+from aoc.grid import Grid
 
-def _parse_file(filename: str) -> str:
-    with open(filename) as f:
-        raw_manifold = f.read()
-    return raw_manifold
 
+def _parse_file(filename: str) -> bytes:
+    with inputs.mapped(filename) as data:
+        return bytes(data)
 
-Coordinates = collections.namedtuple("Coorindate", ["x", "y"])
+
+SPLITTER = ord('^')
+BEAM = ord('|')
 
 
 class Manifold:
-    grid: list[list[str]]
-    source: Coordinates
-    beam_count: list[list[int]]
+    grid: Grid
+    source: int
+    beam_count: list[int]
 
-    def __init__(self, raw_manifold: str):
-        self.grid = list(list(row) for row in raw_manifold.split())
-        self.source = Coordinates(self.grid[0].index('S'), 0)
+    def __init__(self, raw_manifold: bytes):
+        self.grid = Grid.from_buffer(raw_manifold)
+        self.source = self.grid.find('S')
 
-        self.beam_count = [[0 for _ in row] for row in self.grid]
-        self.beam_count[self.source.y][self.source.x] = 1
+        self.beam_count = [0] * len(self.grid.cells)
+        self.beam_count[self.source] = 1
 
     def __str__(self):
-        return '\n'.join(''.join(row) for row in self.grid)
+        return str(self.grid)
 
     def emit_beam(self):
-        y = 1
+        cells = self.grid.cells
+        below = self.grid.offset(1, 0)
         beams = [self.source]
-        while y < len(self.grid):
+        for _ in range(1, self.grid.height):
             new_beams = set()
             for beam in beams:
-                if self.grid[y][beam.x] == '^':
-                    if beam.x != 0:
-                        new_beam = Coordinates(beam.x - 1, y)
-                        self.grid[new_beam.y][new_beam.x] = '|'
-                        self.beam_count[new_beam.y][new_beam.x] += self.beam_count[beam.y][beam.x]
-                        new_beams.add(new_beam)
-                    if beam.x != len(self.grid[y]) - 1:
-                        new_beam = Coordinates(beam.x + 1, y)
-                        self.grid[new_beam.y][new_beam.x] = '|'
-                        self.beam_count[new_beam.y][new_beam.x] += self.beam_count[beam.y][beam.x]
-                        new_beams.add(new_beam)
-                else:
-                    new_beam = Coordinates(beam.x, y)
-                    self.grid[new_beam.y][new_beam.x] = '|'
-                    self.beam_count[new_beam.y][new_beam.x] += self.beam_count[beam.y][beam.x]
+                index = beam + below
+                targets = (index - 1, index + 1) if cells[index] == SPLITTER else (index,)
+                for new_beam in targets:
+                    # Splitting next to an edge sends that half of the beam into the border
+                    if not cells[new_beam]:
+                        continue
+                    cells[new_beam] = BEAM
+                    self.beam_count[new_beam] += self.beam_count[beam]
                     new_beams.add(new_beam)
             beams = new_beams
-            y += 1
 
     @property
     def splits(self) -> int:
-        splits = 0
-        coordinates = []
-        for y, row in enumerate(self.grid):
-            for x, point in enumerate(row):
-                if self.grid[y][x] == '^' and self.grid[y - 1][x] == '|':
-                    splits += 1
-                    coordinates.append((x, y))
-        return splits
+        cells = self.grid.cells
+        above = self.grid.offset(-1, 0)
+        return sum(cells[index + above] == BEAM for index in self.grid.find_all('^'))
 
     @property
     def timelines(self) -> int:
-        return sum(manifold.beam_count[-1])
+        return sum(self.beam_count[index] for index in self.grid.row_indexes(self.grid.height - 1))
+
+
+def _part_1(raw_manifold: bytes) -> int:
+    manifold = Manifold(raw_manifold)
+    manifold.emit_beam()
+    return manifold.splits
+
+
+def _part_2(raw_manifold: bytes) -> int:
+    manifold = Manifold(raw_manifold)
+    manifold.emit_beam()
+    return manifold.timelines
 
 
 if __name__ == "__main__":
@@ -73,7 +75,5 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     raw_manifold = _parse_file(args.filename)
-    manifold = Manifold(raw_manifold)
-    splits = manifold.emit_beam()
-    print(f"Techyon beam splits: {manifold.splits}")
-    print(f"Timelines: {manifold.timelines}")
+    print(f"Techyon beam splits: {_part_1(raw_manifold)}")
+    print(f"Timelines: {_part_2(raw_manifold)}")
@@ -2,19 +2,22 @@ import argparse
 import collections
 import itertools
 import math
+import typing
+
+from aoc import inputs
 
 JunctionBox = collections.namedtuple("JunctionBox", ["x", "y", "z"])
+Distances: typing.TypeAlias = dict[float, tuple[JunctionBox, JunctionBox]]
 
 
-def _parse_file(filename: str) -> str:
-    with open(filename) as f:
-        lines = f.readlines()
-    boxes = []
-    for line in lines:
-        x, y, z = line.split(",")
-        box = JunctionBox(int(x), int(y), int(z))
-        boxes.append(box)
-    return boxes
+def _parse_file(filename: str) -> tuple[list[JunctionBox], Distances]:
+    with inputs.mapped(filename) as data:
+        coordinates = inputs.ints(data)
+    junction_boxes = [
+        JunctionBox(*box) for box in zip(coordinates[::3], coordinates[1::3], coordinates[2::3])
+    ]
+    # Both parts join boxes by distance: pair them up once
+    return junction_boxes, _get_distances(junction_boxes)
 
 
 def _get_distance(box_1: JunctionBox, box_2: JunctionBox) -> float:
@@ -94,19 +97,31 @@ def _join_all_boxes(
     return box_1, box_2
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    junction_boxes = _parse_file(args.filename)
+def _get_distances(
+    junction_boxes: list[JunctionBox],
+) -> dict[float, tuple[JunctionBox, JunctionBox]]:
     pairs = itertools.permutations(junction_boxes, 2)
-    distances = {_get_distance(*pair): pair for pair in pairs}
+    return {_get_distance(*pair): pair for pair in pairs}
 
+
+def _part_1(playground: tuple[list[JunctionBox], Distances]) -> int:
+    _, distances = playground
     circuits = _join_n_circuits(distances, 1000)
     circuits.sort(key=len, reverse=True)
-    result = len(circuits[0]) * len(circuits[1]) * len(circuits[2])
-    print(f"Product of 3 largest circuits: {result}")
+    return len(circuits[0]) * len(circuits[1]) * len(circuits[2])
+
 
+def _part_2(playground: tuple[list[JunctionBox], Distances]) -> int:
+    junction_boxes, distances = playground
     box_1, box_2 = _join_all_boxes(distances, len(junction_boxes))
-    print(f"Product of final connected boxes: {box_1.x * box_2.x}")
+    return box_1.x * box_2.x
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    playground = _parse_file(args.filename)
+    print(f"Product of 3 largest circuits: {_part_1(playground)}")
+    print(f"Product of final connected boxes: {_part_2(playground)}")
@@ -3,6 +3,8 @@ import collections
 import dataclasses
 import itertools
 
+from aoc import inputs
+
 Tile = collections.namedtuple("Tile", ["x", "y"])
 
 
@@ -37,14 +39,15 @@ class Rectangle:
         )
 
 
-def _parse_file(filename: str) -> list[Tile]:
-    with open(filename) as f:
-        lines = f.readlines()
-    tiles = []
-    for line in lines:
-        x, y = line.split(',')
-        tiles.append(Tile(int(x), int(y)))
-    return tiles
+def _parse_file(filename: str) -> tuple[list[Tile], list[Rectangle]]:
+    with inputs.mapped(filename) as data:
+        coordinates = inputs.ints(data)
+    tiles = [Tile(x, y) for x, y in zip(coordinates[::2], coordinates[1::2])]
+    # Both parts look for the largest rectangle: pair up corners once
+    rectangles = [
+        Rectangle(corner_1, corner_2) for corner_1, corner_2 in itertools.combinations(tiles, 2)
+    ]
+    return tiles, rectangles
 
 
 def _get_perimeter(tiles: list[Tile]):
@@ -57,22 +60,26 @@ def _get_perimeter(tiles: list[Tile]):
     # fmt: on
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
+def _part_1(theater: tuple[list[Tile], list[Rectangle]]) -> int:
+    _, rectangles = theater
+    return max(rectangle.area for rectangle in rectangles)
 
-    tiles = _parse_file(args.filename)
-    rectangles = [
-        Rectangle(corner_1, corner_2) for corner_1, corner_2 in itertools.combinations(tiles, 2)
-    ]
-    largest_area = max(rectangle.area for rectangle in rectangles)
-    print(f"Area of largest rectangle: {largest_area}")
 
+def _part_2(theater: tuple[list[Tile], list[Rectangle]]) -> int:
+    tiles, rectangles = theater
     perimeter = _get_perimeter(tiles)
     valid_rectangles = filter(
         lambda r: not any(r.crosses(segment) for segment in perimeter),
         rectangles,
     )
-    largest_valid_area = max(rectangle.area for rectangle in valid_rectangles)
-    print(f"Area of largest red & green rectangle: {largest_valid_area}")
+    return max(rectangle.area for rectangle in valid_rectangles)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    theater = _parse_file(args.filename)
+    print(f"Area of largest rectangle: {_part_1(theater)}")
+    print(f"Area of largest red & green rectangle: {_part_2(theater)}")
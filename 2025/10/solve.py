@@ -1,9 +1,12 @@
 import argparse
 import dataclasses
 import itertools
+import typing
 
 import z3
 
+from aoc import inputs, instrument, parallel
+
 
 @dataclasses.dataclass
 class Schematic:
@@ -44,6 +47,7 @@ class Schematic:
         # Continue until a solution is found
         while True:
             current_sequence, current_lights = sequences.pop(0)
+            instrument.count("light states explored")
             for button in self.buttons:
                 if button == current_sequence[-1]:
                     continue
@@ -245,20 +249,33 @@ class EnhancedMatrix:
         return "\n".join(rows)
 
 
-def _parse_file(filename: str):
-    with open(filename) as f:
-        lines = f.readlines()
-    return [Schematic.from_raw(line) for line in lines]
+def _parse_file(filename: str) -> list[Schematic]:
+    return list(_read_records(filename))
+
+
+def _read_records(filename: str) -> typing.Iterator[Schematic]:
+    for line in inputs.stream(filename):
+        yield Schematic.from_raw(inputs.text(line))
+
+
+def _part_1(schematics: typing.Iterable[Schematic]) -> int:
+    sequences = parallel.imap(Schematic.get_minimal_light_init, schematics)
+    return sum(len(sequence) for sequence in sequences)
+
+
+def _part_2(schematics: typing.Iterable[Schematic]) -> int:
+    return sum(parallel.imap(Schematic.get_minimal_joltage_init, schematics))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
+    parser.add_argument("--stream", action="store_true", help="re-read the input for each part")
     args = parser.parse_args()
 
-    schematics = _parse_file(args.filename)
-    result = sum(len(schematic.get_minimal_light_init()) for schematic in schematics)
-    print(f"Fewest button presses to initialize all machine lights: {result}")
-
-    result = sum(schematic.get_minimal_joltage_init() for schematic in schematics)
-    print(f"Fewest button presses to initialize all joltages: {result}")
+    if args.stream:
+        schematics = inputs.Stream(_read_records, args.filename)
+    else:
+        schematics = _parse_file(args.filename)
+    print(f"Fewest button presses to initialize all machine lights: {_part_1(schematics)}")
+    print(f"Fewest button presses to initialize all joltages: {_part_2(schematics)}")
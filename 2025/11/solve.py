@@ -1,15 +1,15 @@
 import argparse
 import functools
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> dict[str, list[str]]:
-    with open(filename) as f:
-        lines = f.readlines()
 
+def _parse_file(filename: str) -> dict[str, list[str]]:
     devices = {}
-    for line in lines:
-        device, outputs = line.split(":")
-        devices[device] = outputs.split()
+    with inputs.mapped(filename) as data:
+        for line in inputs.lines(data):
+            device, outputs = inputs.text(line).split(":")
+            devices[device] = outputs.split()
     devices["out"] = []
     return devices
 
@@ -34,16 +34,19 @@ class PathFinder:
         return sum(self.count_paths(neighbor, end, required) for neighbor in neighbors)
 
 
+def _part_1(devices: dict[str, list[str]]) -> int:
+    return PathFinder(devices).count_paths("you", "out")
+
+
+def _part_2(devices: dict[str, list[str]]) -> int:
+    return PathFinder(devices).count_paths("svr", "out", required=("fft", "dac"))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename")
     args = parser.parse_args()
 
     devices = _parse_file(args.filename)
-    path_finder = PathFinder(devices)
-
-    paths_to_out = path_finder.count_paths("you", "out")
-    print(f"Number of paths to 'out': {paths_to_out}")
-
-    paths_to_out = path_finder.count_paths("svr", "out", required=("fft", "dac"))
-    print(f"Number of paths to 'out': {paths_to_out}")
+    print(f"Number of paths to 'out': {_part_1(devices)}")
+    print(f"Number of paths to 'out': {_part_2(devices)}")
@@ -2,17 +2,24 @@ import argparse
 import dataclasses
 import re
 
+from aoc import inputs
 
-def _parse_file(filename: str) -> dict[str, list[str]]:
-    with open(filename) as f:
-        raw = f.read().strip()
 
+def _parse_file(filename: str) -> dict[str, list[str]]:
     shapes = []
-    for block in raw.split("\n\n"):
-        if match := re.fullmatch(r"^\d+:\n([#\.\n]+)$", block):
-            shapes.append(match.groups()[0])
-        else:
-            trees = [tree.strip() for tree in block.split('\n')]
+    trees = None
+    with inputs.mapped(filename) as data:
+        # Records view the mapped file, so the last one must be released before it closes
+        record = None
+        for record in inputs.records(data):
+            block = inputs.text(record)
+            if match := re.fullmatch(r"^\d+:\n([#\.\n]+)$", block):
+                shapes.append(match.groups()[0])
+            else:
+                trees = [tree.strip() for tree in block.split('\n')]
+        del record
+    if trees is None:
+        raise ValueError("Cannot find the trees section")
     return shapes, trees
 
 
@@ -46,12 +53,8 @@ class Tree:
         return cls(int(width), int(height), present_count)
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("filename")
-    args = parser.parse_args()
-
-    raw_shapes, raw_trees = _parse_file(args.filename)
+def _part_1(raw_presents: tuple[list[str], list[str]]) -> int:
+    raw_shapes, raw_trees = raw_presents
     presents = [Present.from_raw(shape) for shape in raw_shapes]
     trees = [Tree.from_raw(raw_tree) for raw_tree in raw_trees]
 
@@ -63,4 +66,13 @@ if __name__ == "__main__":
         )
         if present_tiles <= tree_area:
             fillable += 1
-    print(fillable)
+    return fillable
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename")
+    args = parser.parse_args()
+
+    raw_presents = _parse_file(args.filename)
+    print(_part_1(raw_presents))
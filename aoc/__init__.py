@@ -0,0 +1,6 @@
+"""Helpers shared by the solvers, and the runner behind `python -m aoc`.
+
+Install the repository with `pip install -e .` so that each day's `solve.py`
+can import this package when run as a script. The install is editable since
+the runner finds the days next to this package.
+"""
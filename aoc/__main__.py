@@ -0,0 +1,142 @@
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+from aoc import bench, runner
+
+
+def _run(args: argparse.Namespace):
+    start = time.perf_counter()
+    days = runner.discover(selection=args.days)
+    if args.jobs > 1:
+        measurements = runner.run_parallel(
+            days,
+            args.input,
+            trace_memory=not args.no_memory,
+            jobs=args.jobs,
+            expected_seconds=bench.expected_seconds(days, args.input, bench.load_baseline()),
+            use_cache=not args.no_cache,
+            stream=args.stream,
+        )
+    else:
+        measurements = runner.run(
+            days,
+            args.input,
+            trace_memory=not args.no_memory,
+            use_cache=not args.no_cache,
+            stream=args.stream,
+        )
+    for measurement in measurements:
+        print(measurement, flush=True)
+    print(f"Ran {len(days)} day(s) in {time.perf_counter() - start:.4f}s")
+
+
+def _bench(args: argparse.Namespace):
+    days = runner.discover(selection=args.days)
+    baseline = bench.load_baseline(args.baseline)
+    benchmarks = []
+    for benchmark in bench.run(days, repeat=args.repeat):
+        benchmarks.append(benchmark)
+        print(benchmark, flush=True)
+
+    regressions = bench.compare(benchmarks, baseline, args.threshold, args.min_seconds)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    if args.save:
+        bench.save_baseline(benchmarks, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        sys.exit(1)
+
+
+def _profile(args: argparse.Namespace):
+    records = []
+    for day in runner.discover(selection=args.days):
+        if not (filename := day.find_input(args.input)):
+            records.append({"day": str(day), "phase": "input", "error": "no input file"})
+            continue
+        records.extend(
+            runner.profile_day(
+                day,
+                str(filename),
+                profile=args.cprofile,
+                allocations=args.tracemalloc,
+                top=args.top,
+            )
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(records, indent=2) + "\n")
+    else:
+        print(json.dumps(records, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve days in a single process")
+    run_parser.add_argument("days", nargs="*", help="YYYY or YYYY/DD (default: all)")
+    run_parser.add_argument("-i", "--input", default="input", help="input file name per day")
+    run_parser.add_argument("--no-memory", action="store_true", help="skip peak memory tracing")
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always re-parse inputs instead of loading them from the parse cache",
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="feed days which support it their records lazily, re-reading the input per part",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="run this many days at once, longest first by benchmark baseline",
+    )
+    run_parser.set_defaults(handler=_run)
+
+    bench_parser = subparsers.add_parser("bench", help="time days against stored baselines")
+    bench_parser.add_argument("days", nargs="*", help="YYYY or YYYY/DD (default: all)")
+    bench_parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per input")
+    bench_parser.add_argument("--baseline", type=pathlib.Path, default=bench.BASELINE)
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed median slowdown before failing, as a fraction",
+    )
+    bench_parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.001,
+        help="ignore regressions on medians below this duration",
+    )
+    bench_parser.add_argument("--save", action="store_true", help="record results as baseline")
+    bench_parser.set_defaults(handler=_bench)
+
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="run days with solver counters and timers enabled, reporting JSON",
+    )
+    profile_parser.add_argument("days", nargs="*", help="YYYY or YYYY/DD (default: all)")
+    profile_parser.add_argument("-i", "--input", default="input", help="input file name per day")
+    profile_parser.add_argument("--cprofile", action="store_true", help="include cProfile stats")
+    profile_parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="include the largest live allocation sites at the end of each phase",
+    )
+    profile_parser.add_argument(
+        "--top", type=int, default=20, help="entries kept per cProfile/tracemalloc report"
+    )
+    profile_parser.add_argument("-o", "--output", type=pathlib.Path, help="write JSON here")
+    profile_parser.set_defaults(handler=_profile)
+
+    args = parser.parse_args()
+    args.handler(args)
@@ -0,0 +1,44 @@
+"""NumPy helpers for days whose requirements include numpy.
+
+Kept apart from `aoc.inputs` so that days without NumPy never import it.
+"""
+
+import numpy as np
+
+from aoc.inputs import Buffer
+
+ZERO = ord("0")
+MINUS = ord("-")
+# Any number of this many digits fits in an int64
+MAX_DIGITS = 18
+
+
+def ints(buffer: Buffer, signed: bool = True) -> np.ndarray:
+    """Return every integer found in `buffer` as an `int64` array, in order.
+
+    Digits are located and combined with vector operations straight from the
+    buffer's bytes, one pass per digit position, so no Python int or str is
+    built per number. With `signed=False`, a leading dash is a separator.
+    Raises `OverflowError` on numbers longer than `MAX_DIGITS`, rather than
+    wrapping them around.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    is_digit = (data >= ZERO) & (data <= ZERO + 9)
+    edges = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+    if (longest := int(lengths.max(initial=0))) > MAX_DIGITS:
+        raise OverflowError(f"Cannot fit a {longest}-digit number in an int64 array")
+
+    values = np.zeros(len(starts), dtype=np.int64)
+    for position in range(longest):
+        has_digit = lengths > position
+        values[has_digit] *= 10
+        values[has_digit] += data[starts[has_digit] + position] - ZERO
+
+    if signed:
+        negative = starts > 0
+        negative[negative] = data[starts[negative] - 1] == MINUS
+        values[negative] *= -1
+    return values
@@ -0,0 +1,173 @@
+import dataclasses
+import json
+import pathlib
+import statistics
+import typing
+
+from aoc import runner
+
+BASELINE = runner.ROOT / ".benchmarks" / "baseline.json"
+INPUT_PATTERNS = ("sample_input*", "input*")
+
+
+@dataclasses.dataclass
+class Benchmark:
+    day: runner.Day
+    input_name: str
+    phase: str
+    samples: list[float] = dataclasses.field(default_factory=list)
+    error: str | None = None
+
+    def __str__(self):
+        prefix = f"{str(self.day):8s}{self.input_name:24s}{self.phase:8s}"
+        if self.error:
+            return f"{prefix}ERROR {self.error}"
+        return (
+            f"{prefix}median {self.median:.4f}s  p95 {self.p95:.4f}s  ({len(self.samples)} runs)"
+        )
+
+    @property
+    def key(self) -> str:
+        return f"{self.day} {self.input_name} {self.phase}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        if len(self.samples) < 2:
+            return self.samples[0]
+        return statistics.quantiles(self.samples, n=20, method="inclusive")[18]
+
+    def to_json(self) -> dict[str, float]:
+        return {"median": self.median, "p95": self.p95, "runs": len(self.samples)}
+
+
+@dataclasses.dataclass
+class Regression:
+    benchmark: Benchmark
+    baseline: float
+
+    @property
+    def change(self) -> float:
+        return self.benchmark.median / self.baseline - 1
+
+    def __str__(self):
+        return (
+            f"{self.benchmark.key}: median {self.benchmark.median:.4f}s "
+            f"vs baseline {self.baseline:.4f}s ({self.change:+.0%})"
+        )
+
+
+def find_inputs(day: runner.Day) -> list[pathlib.Path]:
+    inputs = {}
+    for directory in (day.solver.parent, day.directory):
+        for pattern in INPUT_PATTERNS:
+            for path in directory.glob(pattern):
+                if path.is_file():
+                    inputs.setdefault(path.name, path)
+    return sorted(inputs.values(), key=lambda path: (path.stat().st_size, path.name))
+
+
+def benchmark_day(
+    day: runner.Day,
+    filename: pathlib.Path,
+    repeat: int = 5,
+) -> list[Benchmark]:
+    """Time parsing and each part `repeat` times, re-parsing on every run."""
+    benchmarks = {}
+    try:
+        module = day.load()
+    except Exception as e:
+        return [Benchmark(day, filename.name, "import", error=f"{type(e).__name__}: {e}")]
+
+    phases = [("parse", module._parse_file)] + [
+        (f"part {index}", function)
+        for index, part in enumerate(runner.PARTS, start=1)
+        if (function := getattr(module, part, None))
+    ]
+    for phase, _ in phases:
+        benchmarks[phase] = Benchmark(day, filename.name, phase)
+
+    for _ in range(repeat):
+        parsing = runner.measure(
+            day, "parse", module._parse_file, str(filename), trace_memory=False
+        )
+        if parsing.error:
+            benchmarks["parse"].error = parsing.error
+            break
+        benchmarks["parse"].samples.append(parsing.seconds)
+
+        for phase, function in phases[1:]:
+            if benchmarks[phase].error:
+                continue
+            measurement = runner.measure(day, phase, function, parsing.answer, trace_memory=False)
+            if measurement.error:
+                benchmarks[phase].error = measurement.error
+            else:
+                benchmarks[phase].samples.append(measurement.seconds)
+
+    return [benchmark for benchmark in benchmarks.values() if benchmark.samples or benchmark.error]
+
+
+def run(days: typing.Iterable[runner.Day], repeat: int = 5) -> typing.Iterator[Benchmark]:
+    for day in days:
+        for filename in find_inputs(day):
+            yield from benchmark_day(day, filename, repeat=repeat)
+
+
+def load_baseline(path: pathlib.Path = BASELINE) -> dict[str, dict[str, float]]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(benchmarks: list[Benchmark], path: pathlib.Path = BASELINE):
+    """Merge `benchmarks` into the stored baseline, keeping entries for days not re-run."""
+    baseline = load_baseline(path)
+    for benchmark in benchmarks:
+        if benchmark.samples:
+            baseline[benchmark.key] = benchmark.to_json()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def expected_seconds(
+    days: typing.Iterable[runner.Day],
+    input_name: str,
+    baseline: dict[str, dict[str, float]],
+) -> dict[runner.Day, float]:
+    """Estimate each day's total run time on `input_name` from its baseline medians."""
+    estimates = {}
+    for day in days:
+        prefix = f"{day} {input_name} "
+        medians = [entry["median"] for key, entry in baseline.items() if key.startswith(prefix)]
+        if medians:
+            estimates[day] = sum(medians)
+    return estimates
+
+
+def compare(
+    benchmarks: list[Benchmark],
+    baseline: dict[str, dict[str, float]],
+    threshold: float = 0.2,
+    min_seconds: float = 0.001,
+) -> list[Regression]:
+    """Report benchmarks whose median exceeds the baseline median by more than
+    `threshold`, ignoring timings under `min_seconds` where noise dominates.
+    """
+    regressions = []
+    for benchmark in benchmarks:
+        if not benchmark.samples or not (previous := baseline.get(benchmark.key)):
+            continue
+        if benchmark.median < min_seconds:
+            continue
+        if benchmark.median > previous["median"] * (1 + threshold):
+            regressions.append(Regression(benchmark, previous["median"]))
+    return regressions
@@ -0,0 +1,67 @@
+"""On-disk cache of parsed puzzle inputs.
+
+Entries are pickles named after a digest of the input's content, the solver's
+source and the shared `aoc` sources, so editing any of them simply misses the
+cache: stale entries never need clearing by hand, only deleting to reclaim space.
+"""
+
+import hashlib
+import os
+import pathlib
+import pickle
+import sys
+import typing
+
+from aoc import inputs
+
+PACKAGE = pathlib.Path(__file__).resolve().parent
+DIRECTORY = pathlib.Path(os.environ.get("AOC_CACHE_DIR", PACKAGE.parent / ".cache"))
+
+T = typing.TypeVar("T")
+
+
+def key(parse: typing.Callable[[str], T], filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        digest.update(hashlib.file_digest(f, "sha256").digest())
+
+    solver = pathlib.Path(sys.modules[parse.__module__].__file__)
+    for source in [solver, *sorted(PACKAGE.glob("*.py"))]:
+        digest.update(source.read_bytes())
+    digest.update(f"{parse.__module__}.{parse.__qualname__}".encode())
+    digest.update(f"{sys.version_info[:2]}".encode())
+    return digest.hexdigest()
+
+
+def load(
+    parse: typing.Callable[[str], T],
+    filename: str,
+    directory: pathlib.Path = DIRECTORY,
+) -> T:
+    """Return `parse(filename)`, from the cache when this input was parsed before."""
+    path = directory / f"{key(parse, filename)}.pickle"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated, or pickled with a since-renamed class: parse it again.
+        pass
+
+    parsed = parse(filename)
+    if not isinstance(parsed, inputs.Stream):
+        # A stream only names its file, which is read again on every iteration anyway
+        _store(path, parsed)
+    return parsed
+
+
+def _store(path: pathlib.Path, parsed: typing.Any):
+    try:
+        data = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Some parsed structures hold lambdas or other unpicklable objects.
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
@@ -0,0 +1,150 @@
+import typing
+
+from aoc import inputs
+from aoc.inputs import Buffer
+
+# Arrows in the same order as `Grid.orthogonal_offsets`, so turning right is `(i + 1) % 4`.
+ARROWS = "^>v<"
+
+
+class Grid:
+    """Rectangular character grid stored as a single `bytearray`.
+
+    Rows are `stride` bytes apart and surrounded by `padding` cells of `border`,
+    so stepping off the grid from any cell lands on a border byte instead of
+    wrapping or raising: neighbor lookups need no bounds checks. Cells are
+    addressed by flat index; hot loops should read `cells` directly and compare
+    against byte values (eg. `cells[i] == ord("#")`).
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        fill: str = ".",
+        border: str = "\0",
+        padding: int = 1,
+    ):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.cells = bytearray(border.encode() * (self.stride * (height + 2 * padding)))
+        row = fill.encode() * width
+        for row_index in range(height):
+            start = self.index(row_index, 0)
+            self.cells[start : start + width] = row  # noqa: E203
+
+        stride = self.stride
+        self.orthogonal_offsets = (-stride, 1, stride, -1)
+        self.diagonal_offsets = (-stride + 1, stride + 1, stride - 1, -stride - 1)
+        self.adjacent_offsets = (
+            -stride,
+            -stride + 1,
+            1,
+            stride + 1,
+            stride,
+            stride - 1,
+            -1,
+            -stride - 1,
+        )
+
+    @classmethod
+    def from_text(cls, text: str, border: str = "\0", padding: int = 1) -> "Grid":
+        return cls.from_buffer(text.encode(), border=border, padding=padding)
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer, border: str = "\0", padding: int = 1) -> "Grid":
+        """Build a grid from raw bytes (eg. a mapped input), copying each row once."""
+        rows = list(inputs.lines(buffer))
+        while rows and not len(rows[0]):
+            rows.pop(0)
+        grid = cls(max(len(row) for row in rows), len(rows), border=border, padding=padding)
+        for row_index, row in enumerate(rows):
+            start = grid.index(row_index, 0)
+            grid.cells[start : start + len(row)] = row  # noqa: E203
+        return grid
+
+    def __str__(self):
+        return "\n".join(row.decode() for row in self.rows())
+
+    def __getitem__(self, key: int | tuple[int, int]) -> str:
+        if isinstance(key, tuple):
+            key = self.index(*key)
+        return chr(self.cells[key])
+
+    def __setitem__(self, key: int | tuple[int, int], value: str):
+        if isinstance(key, tuple):
+            key = self.index(*key)
+        self.cells[key] = ord(value)
+
+    def copy(self) -> "Grid":
+        grid = object.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = self.cells[:]
+        return grid
+
+    def index(self, row: int, column: int) -> int:
+        return (row + self.padding) * self.stride + column + self.padding
+
+    def position(self, index: int) -> tuple[int, int]:
+        row, column = divmod(index, self.stride)
+        return row - self.padding, column - self.padding
+
+    def offset(self, row_delta: int, column_delta: int) -> int:
+        return row_delta * self.stride + column_delta
+
+    def in_bounds(self, index: int) -> bool:
+        row, column = self.position(index)
+        return 0 <= row < self.height and 0 <= column < self.width
+
+    def row_indexes(self, row: int) -> range:
+        start = self.index(row, 0)
+        return range(start, start + self.width)
+
+    def indexes(self) -> typing.Iterator[int]:
+        for row in range(self.height):
+            yield from self.row_indexes(row)
+
+    def rows(self) -> typing.Iterator[bytes]:
+        for row in range(self.height):
+            start = self.index(row, 0)
+            yield bytes(self.cells[start : start + self.width])  # noqa: E203
+
+    def lines(self, offset: int) -> typing.Iterator[bytearray]:
+        """Yield every line of cells running along `offset`, which must point right and/or down.
+
+        Each stride through `cells` visits every cell once; since it can only wrap
+        from one line to the next by crossing the border, text searches over the
+        yielded strings never match across two lines.
+        """
+        if offset <= 0:
+            raise ValueError(f"Offset must be positive, got {offset}")
+        for start in range(offset):
+            yield self.cells[start::offset]
+
+    def find(self, char: str) -> int:
+        """Return the index of the first `char` in the grid, or -1."""
+        value = ord(char)
+        for row in range(self.height):
+            start = self.index(row, 0)
+            if (found := self.cells.find(value, start, start + self.width)) != -1:
+                return found
+        return -1
+
+    def find_all(self, char: str) -> list[int]:
+        value = ord(char)
+        cells = self.cells
+        found = []
+        for row in range(self.height):
+            start = self.index(row, 0)
+            end = start + self.width
+            while (start := cells.find(value, start, end)) != -1:
+                found.append(start)
+                start += 1
+        return found
+
+    def count(self, char: str) -> int:
+        value = ord(char)
+        rows = (self.row_indexes(row) for row in range(self.height))
+        return sum(self.cells.count(value, row.start, row.stop) for row in rows)
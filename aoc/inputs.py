@@ -0,0 +1,120 @@
+"""Memory-mapped access to puzzle inputs.
+
+`mapped` exposes a file's bytes without reading them into a Python object;
+`lines`, `records` and `ints` then walk that buffer handing out `memoryview`
+slices or parsed integers, so parsing never holds the whole input as `str`
+alongside its `split` copies. Views are only valid inside the `mapped` block:
+anything kept beyond it must be converted (eg. with `bytes`, `text` or `int`).
+"""
+
+import contextlib
+import mmap
+import re
+import typing
+
+Buffer: typing.TypeAlias = bytes | bytearray | memoryview | mmap.mmap
+T = typing.TypeVar("T")
+
+INTEGER = re.compile(rb"\d+")
+SIGNED_INTEGER = re.compile(rb"-?\d+")
+LINE_BREAK = re.compile(rb"\r?\n")
+BLANK_LINE = re.compile(rb"\r?\n\r?\n")
+NEWLINES = b"\r\n"
+BLOCK_SIZE = 1 << 20
+
+
+@contextlib.contextmanager
+def mapped(filename: str) -> typing.Iterator[Buffer]:
+    """Map `filename` read-only for the duration of the block."""
+    with open(filename, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b""
+            return
+
+    try:
+        yield buffer
+    finally:
+        # A view still bound to a caller's variable keeps the mapping open until it is released
+        with contextlib.suppress(BufferError):
+            buffer.close()
+
+
+def stream(filename: str) -> typing.Iterator[bytes]:
+    """Yield each non-blank line of `filename`, without its line ending.
+
+    The file is read in buffered blocks rather than mapped, so memory stays
+    constant however large it is, and pipes (eg. `/dev/stdin`) work too.
+    """
+    with open(filename, "rb") as f:
+        for line in f:
+            if line := line.rstrip(b"\r\n"):
+                yield line
+
+
+def blocks(filename: str, size: int = BLOCK_SIZE) -> typing.Iterator[bytes]:
+    """Yield `filename` in blocks of `size` bytes (the last may be shorter).
+
+    Like `stream`, but for inputs which are not line-oriented: a token may be
+    split across two consecutive blocks.
+    """
+    with open(filename, "rb") as f:
+        while block := f.read(size):
+            yield block
+
+
+class Stream(typing.Generic[T]):
+    """Re-iterable records of a file, read afresh by `read` on every iteration.
+
+    Lets each part of a line-independent puzzle fold over its input in constant
+    memory, where a parsed list would hold every record at once.
+    """
+
+    def __init__(self, read: typing.Callable[[str], typing.Iterator[T]], filename: str):
+        self.read = read
+        self.filename = filename
+
+    def __iter__(self) -> typing.Iterator[T]:
+        return self.read(self.filename)
+
+
+def _split(buffer: Buffer, separator: re.Pattern) -> typing.Iterator[memoryview]:
+    view = memoryview(buffer)
+    end = len(view)
+    while end and view[end - 1] in NEWLINES:
+        end -= 1
+    start = 0
+    for match in separator.finditer(view, 0, end):
+        yield view[start : match.start()]  # noqa: E203
+        start = match.end()
+    if start < end:
+        yield view[start:end]
+
+
+def lines(buffer: Buffer) -> typing.Iterator[memoryview]:
+    """Yield each line of `buffer`, without its line ending.
+
+    Trailing blank lines are skipped; blank lines within the buffer are not.
+    """
+    return _split(buffer, LINE_BREAK)
+
+
+def records(buffer: Buffer) -> typing.Iterator[memoryview]:
+    """Yield each blank-line-separated block of `buffer`."""
+    return _split(buffer, BLANK_LINE)
+
+
+def ints(buffer: Buffer, signed: bool = True) -> list[int]:
+    """Return every integer found in `buffer`, in order.
+
+    With `signed=False`, a leading dash is a separator (eg. in ranges like `3-5`).
+    """
+    pattern = SIGNED_INTEGER if signed else INTEGER
+    return [int(match) for match in pattern.findall(buffer)]
+
+
+def text(buffer: Buffer) -> str:
+    """Decode `buffer`, for solvers which genuinely operate on `str`."""
+    return str(buffer, "utf-8")
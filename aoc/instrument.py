@@ -0,0 +1,33 @@
+"""Opt-in instrumentation for solvers.
+
+Solvers call `count` in hot loops and may wrap sub-steps in `timer`; both are
+no-ops unless an `aoc.runner.capture` is active, which is how `python -m aoc
+profile` runs every phase. Nothing else is imported, so solvers pay only a
+function call.
+"""
+
+import collections
+import contextlib
+import time
+import typing
+
+ENABLED = False
+counters = collections.Counter()
+timers = collections.defaultdict(float)
+
+
+def count(name: str, amount: int = 1):
+    if ENABLED:
+        counters[name] += amount
+
+
+@contextlib.contextmanager
+def timer(name: str) -> typing.Iterator[None]:
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timers[name] += time.perf_counter() - start
@@ -0,0 +1,109 @@
+import collections
+import concurrent.futures
+import itertools
+import math
+import multiprocessing
+import os
+import typing
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
+def _default_workers() -> int:
+    if workers := os.environ.get("AOC_WORKERS"):
+        return int(workers)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WORKERS = _default_workers()
+
+
+def set_workers(count: int):
+    global WORKERS
+    WORKERS = max(count, 1)
+
+
+def executor(workers: int | None = None, **kwargs) -> concurrent.futures.ProcessPoolExecutor:
+    # Forked workers inherit every solver the runner has imported, so their
+    # functions can be pickled by reference even though they are not on sys.path.
+    if "fork" in multiprocessing.get_all_start_methods():
+        kwargs.setdefault("mp_context", multiprocessing.get_context("fork"))
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers or WORKERS, **kwargs)
+
+
+def map(
+    function: typing.Callable[[T], R],
+    iterable: typing.Iterable[T],
+    chunksize: int | None = None,
+    workers: int | None = None,
+) -> list[R]:
+    """Apply `function` to every item over a process pool, preserving order.
+
+    Items are sent to workers `chunksize` at a time (by default, enough for four
+    chunks per worker). Work that fits in a single chunk runs in this process, so
+    passing a large `chunksize` keeps cheap per-item work serial on small inputs.
+    """
+    items = list(iterable)
+    workers = min(workers or WORKERS, len(items))
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(items) / (workers * 4))) if workers else 1
+    if workers <= 1 or len(items) <= chunksize:
+        return [function(item) for item in items]
+
+    with executor(workers) as pool:
+        return list(pool.map(function, items, chunksize=chunksize))
+
+
+def imap(
+    function: typing.Callable[[T], R],
+    iterable: typing.Iterable[T],
+    chunksize: int = 1,
+    workers: int | None = None,
+) -> typing.Iterator[R]:
+    """Lazily apply `function` to every item over a process pool, preserving order.
+
+    Unlike `map`, items are only pulled from `iterable` as chunks are submitted,
+    with at most two chunks per worker in flight, so memory stays bounded when
+    streaming an input of any size. Work that fits in a single chunk runs in this
+    process.
+    """
+    workers = workers or WORKERS
+    pending_chunks = chunks(iterable, chunksize)
+    peeked = list(itertools.islice(pending_chunks, 2))
+    pending_chunks = itertools.chain(peeked, pending_chunks)
+    if workers <= 1 or len(peeked) < 2:
+        yield from (function(item) for chunk in pending_chunks for item in chunk)
+        return
+
+    with executor(workers) as pool:
+        in_flight = collections.deque()
+        for chunk in pending_chunks:
+            in_flight.append(pool.submit(_apply, function, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _apply(function: typing.Callable[[T], R], chunk: list[T]) -> list[R]:
+    return [function(item) for item in chunk]
+
+
+def chunks(iterable: typing.Iterable[T], size: int) -> typing.Iterator[list[T]]:
+    """Lazily split `iterable` into lists of `size` items (the last may be shorter)."""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def batches(items: typing.Sequence[T], count: int | None = None) -> list[typing.Sequence[T]]:
+    """Split `items` into `count` contiguous slices (by default, one per worker)."""
+    if not items:
+        return []
+    count = max(min(count or WORKERS, len(items)), 1)
+    size = math.ceil(len(items) / count)
+    return [items[i : i + size] for i in range(0, len(items), size)]  # noqa: E203
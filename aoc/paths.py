@@ -0,0 +1,83 @@
+"""Cheapest paths over integer-encoded states.
+
+States are plain ints below a known `size`, such as `Grid` cell indexes or
+`index * 4 + facing` for walkers that turn, so costs are kept in flat lists
+indexed by state and no per-state object is built during a search.
+"""
+
+import collections
+import heapq
+import math
+import typing
+
+from aoc import instrument
+
+Edges: typing.TypeAlias = typing.Callable[[int], typing.Iterable[tuple[int, int]]]
+
+
+def dijkstra(
+    sources: typing.Iterable[int],
+    size: int,
+    edges: Edges,
+    targets: typing.Container[int] = (),
+) -> list[float]:
+    """Return the cost of the cheapest path from any of `sources` to each state, or `math.inf`.
+
+    `edges(state)` yields `(next_state, cost)` pairs with non-negative costs.
+    States are only pushed onto the heap when a cheaper path reaches them, and
+    entries outdated by a later push are skipped when popped. The search stops
+    as soon as any of `targets` is reached: only its cost is then known to be
+    final, along with those of the states reached before it.
+    """
+    costs = [math.inf] * size
+    heap = []
+    for source in sources:
+        costs[source] = 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+
+    while heap:
+        cost, state = heapq.heappop(heap)
+        if cost > costs[state]:
+            continue
+        if state in targets:
+            break
+        instrument.count("nodes expanded")
+        for next_state, step_cost in edges(state):
+            next_cost = cost + step_cost
+            if next_cost < costs[next_state]:
+                costs[next_state] = next_cost
+                heapq.heappush(heap, (next_cost, next_state))
+                instrument.count("queue pushes")
+    return costs
+
+
+def trace_back(
+    targets: typing.Iterable[int],
+    costs: list[float],
+    reverse_edges: Edges,
+) -> list[int]:
+    """Return every state on a cheapest path to any of `targets`, given the `costs` of a search.
+
+    `reverse_edges(state)` yields `(previous_state, cost)` for each edge into
+    `state`: the edge lies on a cheapest path when it accounts for the whole
+    difference in cost, so no predecessor sets need to be kept while searching.
+    Unreachable targets are ignored.
+    """
+    visited = bytearray(len(costs))
+    states = []
+    pending = collections.deque()
+    for target in targets:
+        if not visited[target] and costs[target] < math.inf:
+            visited[target] = 1
+            pending.append(target)
+
+    while pending:
+        state = pending.popleft()
+        states.append(state)
+        cost = costs[state]
+        for previous_state, step_cost in reverse_edges(state):
+            if not visited[previous_state] and costs[previous_state] + step_cost == cost:
+                visited[previous_state] = 1
+                pending.append(previous_state)
+    return states
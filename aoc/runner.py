@@ -0,0 +1,366 @@
+import concurrent.futures
+import contextlib
+import cProfile
+import dataclasses
+import functools
+import importlib.util
+import math
+import pathlib
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+import types
+import typing
+
+from aoc import cache, inputs, instrument, parallel
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+PARTS = ("_part_1", "_part_2")
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class Day:
+    year: int
+    day: int
+    solver: pathlib.Path = dataclasses.field(compare=False)
+
+    def __str__(self):
+        return f"{self.year}/{self.day:02d}"
+
+    @property
+    def directory(self) -> pathlib.Path:
+        if self.solver.parent.name == "python":
+            return self.solver.parent.parent
+        return self.solver.parent
+
+    @property
+    def module_name(self) -> str:
+        return f"solve_{self.year}_{self.day:02d}"
+
+    def find_input(self, name: str) -> pathlib.Path | None:
+        for directory in (self.solver.parent, self.directory):
+            if (path := directory / name).is_file():
+                return path
+        return None
+
+    def load(self) -> types.ModuleType:
+        if module := sys.modules.get(self.module_name):
+            return module
+        spec = importlib.util.spec_from_file_location(self.module_name, self.solver)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[self.module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[self.module_name]
+            raise
+        return module
+
+
+@dataclasses.dataclass
+class Measurement:
+    day: Day
+    phase: str
+    seconds: float = 0.0
+    peak_memory: int | None = None
+    answer: typing.Any = None
+    error: str | None = None
+
+    def __str__(self):
+        memory = "" if self.peak_memory is None else _format_bytes(self.peak_memory)
+        outcome = f"ERROR {self.error}" if self.error else self.answer
+        if self.phase in ("import", "parse") and not self.error:
+            outcome = ""
+        return f"{str(self.day):8s}{self.phase:8s}{self.seconds:10.4f}s{memory:>12s}  {outcome}"
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def discover(
+    root: pathlib.Path = ROOT,
+    selection: typing.Iterable[str] = (),
+) -> list[Day]:
+    """Find every `YYYY/DD/solve.py` or `YYYY/DD/python/solve.py`, filtered by
+    `YYYY` or `YYYY/DD` selectors.
+    """
+    selectors = [_parse_selector(selector) for selector in selection]
+    days = []
+    for pattern in ("*/*/solve.py", "*/*/python/solve.py"):
+        for solver in root.glob(pattern):
+            year, day = solver.relative_to(root).parts[:2]
+            if not (re.fullmatch(r"\d{4}", year) and re.fullmatch(r"\d{2}", day)):
+                continue
+            found = Day(int(year), int(day), solver)
+            if not selectors or any(
+                found.year == year and day in (None, found.day) for year, day in selectors
+            ):
+                days.append(found)
+    return sorted(days)
+
+
+def _parse_selector(selector: str) -> tuple[int, int | None]:
+    if not (match := re.fullmatch(r"(?P<year>\d{4})(/(?P<day>\d{1,2}))?", selector)):
+        raise ValueError(f"Cannot parse day selector: {selector}")
+    day = match.group("day")
+    return int(match.group("year")), int(day) if day else None
+
+
+def measure(
+    day: Day,
+    phase: str,
+    function: typing.Callable,
+    *args,
+    trace_memory: bool = True,
+) -> Measurement:
+    measurement = Measurement(day, phase)
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+
+    start = time.perf_counter()
+    try:
+        measurement.answer = function(*args)
+    except Exception as e:
+        measurement.error = f"{type(e).__name__}: {e}"
+    measurement.seconds = time.perf_counter() - start
+
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        measurement.peak_memory = max(peak - baseline, 0)
+    return measurement
+
+
+def run_day(
+    day: Day,
+    filename: pathlib.Path,
+    trace_memory: bool = True,
+    use_cache: bool = False,
+    stream: bool = False,
+) -> typing.Iterator[Measurement]:
+    """Import the day's solver, then time its parsing and each of its parts.
+
+    With `use_cache`, parsed input is loaded from (or saved to) the `aoc.cache`
+    directory, so the parse phase measures a cache read on later runs. With
+    `stream`, solvers defining `_read_records` get an `inputs.Stream` instead,
+    so each part reads and folds its records in constant memory.
+    """
+    loading = measure(day, "import", day.load, trace_memory=trace_memory)
+    module, loading.answer = loading.answer, None
+    yield loading
+    if loading.error:
+        return
+
+    parse = module._parse_file
+    if stream and hasattr(module, "_read_records"):
+        parse = functools.partial(inputs.Stream, module._read_records)
+    elif use_cache:
+        parse = functools.partial(cache.load, parse)
+    parsing = measure(day, "parse", parse, str(filename), trace_memory=trace_memory)
+    yield parsing
+    if parsing.error:
+        return
+
+    for index, part in enumerate(PARTS, start=1):
+        if function := getattr(module, part, None):
+            yield measure(
+                day,
+                f"part {index}",
+                function,
+                parsing.answer,
+                trace_memory=trace_memory,
+            )
+
+
+def run(
+    days: typing.Iterable[Day],
+    input_name: str = "input",
+    trace_memory: bool = True,
+    use_cache: bool = False,
+    stream: bool = False,
+) -> typing.Iterator[Measurement]:
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    try:
+        for day in days:
+            if not (filename := day.find_input(input_name)):
+                yield Measurement(day, "input", error=f"no '{input_name}' file")
+                continue
+            yield from run_day(day, filename, trace_memory, use_cache, stream)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+
+def _run_day_in_worker(
+    day: Day,
+    filename: pathlib.Path,
+    trace_memory: bool,
+    use_cache: bool,
+    stream: bool,
+) -> list[Measurement]:
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    measurements = list(run_day(day, filename, trace_memory, use_cache, stream))
+    for measurement in measurements:
+        # Parsed input may hold instances of solver classes the parent never imported.
+        if measurement.phase == "parse":
+            measurement.answer = None
+    return measurements
+
+
+def run_parallel(
+    days: typing.Iterable[Day],
+    input_name: str = "input",
+    trace_memory: bool = True,
+    jobs: int | None = None,
+    expected_seconds: dict[Day, float] | None = None,
+    use_cache: bool = False,
+    stream: bool = False,
+) -> typing.Iterator[Measurement]:
+    """Run whole days across a process pool, yielding each day's measurements as it finishes.
+
+    Days are submitted longest expected duration first (days without an
+    estimate before all others), so the slowest ones never start last. Solvers
+    run serially within each worker, since the cores are already busy.
+    """
+    expected_seconds = expected_seconds or {}
+    schedule = sorted(days, key=lambda day: -expected_seconds.get(day, math.inf))
+    with parallel.executor(jobs, initializer=parallel.set_workers, initargs=(1,)) as pool:
+        futures = []
+        for day in schedule:
+            if not (filename := day.find_input(input_name)):
+                yield Measurement(day, "input", error=f"no '{input_name}' file")
+                continue
+            futures.append(
+                pool.submit(_run_day_in_worker, day, filename, trace_memory, use_cache, stream)
+            )
+
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
+
+
+@dataclasses.dataclass
+class Capture:
+    counters: dict[str, int] = dataclasses.field(default_factory=dict)
+    timers: dict[str, float] = dataclasses.field(default_factory=dict)
+    profile: list[dict[str, typing.Any]] | None = None
+    allocations: list[dict[str, typing.Any]] | None = None
+
+
+@contextlib.contextmanager
+def capture(
+    profile: bool = False,
+    allocations: bool = False,
+    top: int = 20,
+) -> typing.Iterator[Capture]:
+    """Record `aoc.instrument` counters and timers (plus, optionally, the `top` cProfile entries
+    by cumulative time and the `top` live allocation sites) for the block.
+    """
+    captured = Capture()
+    instrument.counters.clear()
+    instrument.timers.clear()
+    profiler = cProfile.Profile() if profile else None
+    started_tracing = allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    instrument.ENABLED = True
+    if profiler:
+        profiler.enable()
+    try:
+        yield captured
+    finally:
+        if profiler:
+            profiler.disable()
+        instrument.ENABLED = False
+        captured.counters = dict(instrument.counters)
+        captured.timers = dict(instrument.timers)
+        if profiler:
+            captured.profile = _profile_entries(profiler, top)
+        if allocations:
+            captured.allocations = _allocation_entries(tracemalloc.take_snapshot(), top)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def _profile_entries(profiler: cProfile.Profile, top: int) -> list[dict[str, typing.Any]]:
+    stats = pstats.Stats(profiler).stats
+    entries = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [
+        {
+            "function": f"{pathlib.Path(filename).name}:{line}({function})",
+            "calls": calls,
+            "tottime": total_time,
+            "cumtime": cumulative_time,
+        }
+        for (filename, line, function), (_, calls, total_time, cumulative_time, _) in entries
+    ]
+
+
+def _allocation_entries(snapshot: tracemalloc.Snapshot, top: int) -> list[dict[str, typing.Any]]:
+    ignored = (tracemalloc.__file__, cProfile.__file__, pstats.__file__, __file__)
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, path) for path in ignored])
+    return [
+        {
+            "location": f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}",
+            "size": statistic.size,
+            "count": statistic.count,
+        }
+        for statistic in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def profile_day(
+    day: Day,
+    filename: str,
+    profile: bool = False,
+    allocations: bool = False,
+    top: int = 20,
+) -> list[dict[str, typing.Any]]:
+    """Run each phase of `day` under a `capture`, returning one JSON-ready record per phase.
+
+    Solvers run serially, so work farmed out to `aoc.parallel` is counted too.
+    """
+    parallel.set_workers(1)
+    records = []
+
+    def _run_phase(phase: str, function: typing.Callable, *args) -> Measurement:
+        with capture(profile, allocations, top) as captured:
+            measurement = measure(day, phase, function, *args, trace_memory=False)
+        record = {
+            "day": str(day),
+            "phase": phase,
+            "seconds": measurement.seconds,
+            "error": measurement.error,
+        }
+        if phase.startswith("part"):
+            record["answer"] = _jsonable(measurement.answer)
+        record.update({key: value for key, value in vars(captured).items() if value is not None})
+        records.append(record)
+        return measurement
+
+    loading = measure(day, "import", day.load, trace_memory=False)
+    if loading.error:
+        return [{"day": str(day), "phase": "import", "error": loading.error}]
+    module = loading.answer
+
+    parsing = _run_phase("parse", module._parse_file, filename)
+    if not parsing.error:
+        for index, part in enumerate(PARTS, start=1):
+            if function := getattr(module, part, None):
+                _run_phase(f"part {index}", function, parsing.answer)
+    return records
+
+
+def _jsonable(answer: typing.Any) -> typing.Any:
+    if answer is None or isinstance(answer, (bool, int, float, str)):
+        return answer
+    return str(answer)